@@ -0,0 +1,184 @@
+"""
+End-to-end throughput of scraping pipeline on in-process fake browser: page
+navigation, `BaseHtmlItem.from_page()`, parsing with `get_vector()` and schema
+extraction, run by pool of pages with given concurrency.
+
+    $ python benchmarks/loadtest.py --pages 2000 --concurrency 16 --latency 5 20
+    $ python benchmarks/loadtest.py --fixtures path/to/html --output report.json
+
+Pages are synthetic listings unless `--fixtures` directory is given. Latency is
+measured per page, from navigation start to extracted records.
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+from scrap import BaseHtmlItem, LazyVector, PagePool, Schema, __version__
+from scrap.fake import FakeBrowser
+
+SCHEMA = Schema(
+    {
+        'title': LazyVector().css('h2').text().normspace(),
+        'link': LazyVector().css('a').attr('href'),
+        'price': LazyVector().css('span.price').text().float(),
+    },
+    rows=LazyVector().css('div.card'),
+    first=True,
+)
+
+
+def listing_page(page: int, cards: int) -> str:
+    items = ''.join(
+        f'<div class="card" id="c{i}">'
+        f'<h2 class="title"> Item  {page}-{i} </h2>'
+        f'<a href="/item/{page}/{i}">link</a>'
+        f'<span class="price">{i}.99</span>'
+        f'<p>Description of item {i} with <b>bold</b> text.</p>'
+        '</div>'
+        for i in range(cards)
+    )
+    return f'<html><body><nav><a href="/">home</a></nav>{items}</body></html>'
+
+
+def build_site(args: argparse.Namespace) -> tuple[FakeBrowser, list[str]]:
+    latency = tuple(args.latency) if len(args.latency) == 2 else args.latency[0]
+    if args.fixtures:
+        root = Path(args.fixtures)
+        paths = sorted(p.relative_to(root).as_posix() for p in root.rglob('*.html'))
+        if not paths:
+            raise SystemExit(f'No html files in {root}')
+        browser = FakeBrowser(root, latency=latency, seed=0)
+    else:
+        paths = [f'page/{i}.html' for i in range(min(args.pages, 100))]
+        site = {f'/{p}': listing_page(i, args.cards) for i, p in enumerate(paths)}
+        browser = FakeBrowser(site, latency=latency, seed=0)
+    urls = [f'https://example.com/{paths[i % len(paths)]}' for i in range(args.pages)]
+    return browser, urls
+
+
+async def run(
+    browser: FakeBrowser,
+    urls: list[str],
+    concurrency: int,
+) -> tuple[list[float], int, float]:
+    """
+    Scrape all urls, return per page latencies, number of records and total time.
+    """
+    queue: asyncio.Queue[str] = asyncio.Queue()
+    for url in urls:
+        queue.put_nowait(url)
+    latencies: list[float] = []
+    records = 0
+
+    async def worker(pool: PagePool) -> None:
+        nonlocal records
+        while not queue.empty():
+            url = queue.get_nowait()
+            start = time.perf_counter()
+            async with pool.page() as page:
+                await page.goto_url(url)
+                item = await BaseHtmlItem.from_page(page)
+            records += len(SCHEMA.run(item.get_vector()))
+            item.drop_tree()
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    async with PagePool(browser, size=concurrency) as pool:
+        await asyncio.gather(*(worker(pool) for _ in range(concurrency)))
+    return latencies, records, time.perf_counter() - start
+
+
+def percentiles(values: list[float]) -> dict[str, float]:
+    cuts = statistics.quantiles(values, n=100, method='inclusive')
+    return {'p50': cuts[49], 'p90': cuts[89], 'p99': cuts[98], 'max': max(values)}
+
+
+def peak_rss() -> int:
+    """
+    Peak resident set size of process in bytes.
+    """
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--pages', type=int, default=1000, help='pages to scrape')
+    parser.add_argument('--cards', type=int, default=50, help='cards per page')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument(
+        '--latency',
+        type=float,
+        nargs='+',
+        default=[0.0],
+        metavar='MS',
+        help='navigation latency in ms, or min and max of random latency',
+    )
+    parser.add_argument('--fixtures', help='serve html files from directory')
+    parser.add_argument(
+        '--tracemalloc', action='store_true', help='trace peak Python allocations'
+    )
+    parser.add_argument('--output', help='write report to JSON file')
+    args = parser.parse_args()
+    if len(args.latency) > 2:
+        parser.error('--latency takes one or two values')
+
+    browser, urls = build_site(args)
+    if args.tracemalloc:
+        tracemalloc.start()
+    latencies, records, elapsed = asyncio.run(run(browser, urls, args.concurrency))
+    traced_peak = tracemalloc.get_traced_memory()[1] if args.tracemalloc else None
+    tracemalloc.stop()
+
+    lat = percentiles(latencies)
+    report: dict[str, Any] = {
+        'meta': {
+            'scrap': __version__,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+        },
+        'params': {
+            'pages': args.pages,
+            'concurrency': args.concurrency,
+            'latency_ms': args.latency,
+            'fixtures': args.fixtures,
+        },
+        'results': {
+            'pages_per_sec': len(urls) / elapsed,
+            'records': records,
+            'elapsed': elapsed,
+            'latency': lat,
+            'peak_rss': peak_rss(),
+            'peak_traced': traced_peak,
+        },
+    }
+    print(
+        f'{len(urls)} pages, {records} records in {elapsed:.2f} s: '
+        f'{len(urls) / elapsed:.1f} pages/s',
+        file=sys.stderr,
+    )
+    print(
+        'latency ms: '
+        + ', '.join(f'{k} {v * 1000:.1f}' for k, v in lat.items())
+        + f'; peak rss {peak_rss() / 2**20:.1f} MiB',
+        file=sys.stderr,
+    )
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,48 @@
+"""
+Startup time of `import scrap` in fresh interpreter, compared to eager import of
+all submodules, as `scrap/__init__.py` did before lazy attributes.
+
+    $ python benchmarks/startup.py --runs 20
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+CASES = {
+    'python': 'pass',
+    'import scrap': 'import scrap',
+    'import scrap (eager)': (
+        'import scrap.batch, scrap.item, scrap.page, scrap.project, scrap.selector,'
+        ' scrap.store, scrap.stvector'
+    ),
+    'get_projects()': 'import scrap; scrap.get_projects()',
+}
+
+
+def measure(code: str, runs: int) -> tuple[float, int]:
+    """
+    Get median wall time in ms and number of loaded modules.
+    """
+    cmd = [sys.executable, '-c', f'{code}; import sys; print(len(sys.modules))']
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        out = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000, int(out)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args()
+    for name, code in CASES.items():
+        ms, modules = measure(code, args.runs)
+        print(f'{name:<24} {ms:8.1f} ms {modules:6} modules')
+
+
+if __name__ == '__main__':
+    main()
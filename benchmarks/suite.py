@@ -0,0 +1,226 @@
+"""
+Benchmarks of structured vector operations on typical data shapes, and of html
+selectors on synthetic listing pages of increasing size.
+
+    $ python benchmarks/suite.py --output baseline.json
+    $ python benchmarks/suite.py --compare baseline.json --threshold 0.1
+
+Results are best and median times of single call; in compare mode, the command
+fails if any benchmark best time is slower than baseline by more than threshold.
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import timeit
+from collections.abc import Callable, Iterator
+from datetime import UTC, datetime
+from functools import partial
+from typing import Any
+
+from scrap import HtmlVector, __version__
+from scrap.stvector import HtmlElement, Nested, StVector, copy_upto_level, iter_at_level
+
+type Benchmark = tuple[str, Callable[[], object]]
+
+
+# shapes
+
+
+def shallow_wide() -> tuple[Nested[int], int]:
+    return list(range(100_000)), 1
+
+
+def deep_narrow() -> tuple[Nested[int], int]:
+    def build(depth: int) -> Nested[int]:
+        return [depth, depth] if depth == 1 else [build(depth - 1), build(depth - 1)]
+
+    return build(12), 12
+
+
+def ragged() -> tuple[Nested[int], int]:
+    rnd = random.Random(0)  # noqa: S311
+    data = [
+        [list(range(rnd.randint(1, 20))) for _ in range(rnd.randint(1, 30))]
+        for _ in range(300)
+    ]
+    return data, 3  # type: ignore[return-value]
+
+
+def listing() -> tuple[Nested[int], int]:
+    # pages with cards with few fields each
+    data = [[[i, j, 1, 2, 3] for j in range(40)] for i in range(200)]
+    return data, 3  # type: ignore[return-value]
+
+
+SHAPES = {
+    'shallow-wide': shallow_wide,
+    'deep-narrow': deep_narrow,
+    'ragged': ragged,
+    'listing': listing,
+}
+
+
+def vector_benchmarks() -> Iterator[Benchmark]:
+    for shape, factory in SHAPES.items():
+        data, depth = factory()
+        vector = StVector(data, depth)
+        yield f'{shape}/construct', partial(StVector, data, depth)
+        yield f'{shape}/to_list', vector.to_list
+        yield f'{shape}/copy_upto_level', partial(copy_upto_level, data, depth)
+        yield f'{shape}/iter_at_level', partial(count_at_level, data, depth)
+        yield f'{shape}/apply', partial(vector.apply, to_str)
+        yield f'{shape}/getitem', partial(vector.__getitem__, 0)
+        if depth > 1:
+            yield f'{shape}/flatten', vector.flatten
+            yield f'{shape}/level', partial(vector.level, up=1)
+
+
+def to_str(item: object) -> str:
+    return str(item)
+
+
+def count_at_level(data: Nested[int], level: int) -> int:
+    return sum(1 for _ in iter_at_level(data, level))
+
+
+# html
+
+
+def listing_page(cards: int) -> str:
+    items = ''.join(
+        f'<div class="card" id="c{i}">'
+        f'<h2 class="title"> Item  {i} </h2>'
+        f'<a href="/item/{i}">link</a>'
+        f'<span class="price">{i}.99</span>'
+        f'<p>Description of item {i} with <b>bold</b> text.</p>'
+        '</div>'
+        for i in range(cards)
+    )
+    return f'<html><body><nav><a href="/">home</a></nav>{items}</body></html>'
+
+
+def html_benchmarks() -> Iterator[Benchmark]:
+    for cards in (10, 100, 1000):
+        html = listing_page(cards)
+        page = HtmlVector.from_string(html, base_url='https://example.com')
+        cards_vector = page.css('div.card')
+        name = f'html-{cards}'
+        yield f'{name}/parse', partial(HtmlVector.from_string, html)
+        yield f'{name}/css', partial(page.css, 'div.card h2.title')
+        yield f'{name}/xpath', partial(page.xpath, '//div[@class="card"]/h2')
+        yield f'{name}/css-nested', partial(cards_vector.css, 'span.price')
+        yield f'{name}/attr', partial(links, cards_vector)
+        yield f'{name}/text', partial(titles, cards_vector)
+        yield f'{name}/float', partial(prices, cards_vector)
+
+
+def links(cards: HtmlVector[HtmlElement]) -> StVector[str | None]:
+    return cards.css('a').attr('href')
+
+
+def titles(cards: HtmlVector[HtmlElement]) -> StVector[str]:
+    return cards.css('h2').text().normspace()
+
+
+def prices(cards: HtmlVector[HtmlElement]) -> StVector[float | None]:
+    return cards.css('span.price').text().float()
+
+
+# runner
+
+
+def run(
+    benchmarks: Iterator[Benchmark],
+    repeat: int,
+    pattern: str | None,
+) -> dict[str, dict[str, float]]:
+    results = {}
+    for name, func in benchmarks:
+        if pattern and pattern not in name:
+            continue
+        timer = timeit.Timer(func)
+        number, _ = timer.autorange()
+        times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+        results[name] = {
+            'best': min(times),
+            'median': statistics.median(times),
+            'number': number,
+        }
+        print(f'{name:<32} {format_time(min(times)):>10}', file=sys.stderr)
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    threshold: float,
+) -> list[str]:
+    """
+    Print comparison table, return names of regressed benchmarks.
+    """
+    regressed = []
+    for name, stats in results.items():
+        if (base := baseline.get(name)) is None:
+            print(f'{name:<32} {format_time(stats["best"]):>10} {"new":>10}')
+            continue
+        ratio = stats['best'] / base['best']
+        flag = ''
+        if ratio > 1 + threshold:
+            flag = '  REGRESSION'
+            regressed.append(name)
+        print(
+            f'{name:<32} {format_time(base["best"]):>10} '
+            f'{format_time(stats["best"]):>10} {ratio:6.2f}x{flag}'
+        )
+    return regressed
+
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (('s', 1.0), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f'{seconds / scale:.2f} {unit}'
+    return f'{seconds / 1e-9:.0f} ns'
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('-k', dest='pattern', help='run benchmarks matching substring')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help='write results to JSON file')
+    parser.add_argument('--compare', help='compare to baseline JSON file')
+    parser.add_argument('--threshold', type=float, default=0.1)
+    args = parser.parse_args()
+
+    benchmarks = iter([*vector_benchmarks(), *html_benchmarks()])
+    report: dict[str, Any] = {
+        'meta': {
+            'scrap': __version__,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': datetime.now(UTC).isoformat(),
+        },
+        'results': run(benchmarks, args.repeat, args.pattern),
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        regressed = compare(report['results'], baseline, args.threshold)
+        if regressed:
+            print(f'{len(regressed)} benchmark(s) regressed', file=sys.stderr)
+            return 1
+    elif not args.output:
+        json.dump(report, sys.stdout, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
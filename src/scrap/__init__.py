@@ -1,15 +1,31 @@
+import importlib
+from typing import TYPE_CHECKING
+
 from .__version__ import __version__ as __version__
-from .exception import ShapeError
-from .item import BaseDataItem, BaseHtmlItem
-from .page import (
-    BasePageElement,
-    BasePageModel,
-    BrowserProtocol,
-    LocatorProtocol,
-    PageProtocol,
-)
-from .project import Project, get_projects
-from .stvector import HtmlVector
+
+if TYPE_CHECKING:
+    from .batch import extract_many
+    from .crawl import Crawler, CrawlStats
+    from .exception import ShapeError
+    from .fake import FakeBrowser
+    from .incremental import IncrementalSchema
+    from .item import BaseDataItem, BaseHtmlItem, CompactHtmlItem
+    from .memory import MemoryUsage
+    from .page import (
+        BasePageElement,
+        BasePageModel,
+        BrowserProtocol,
+        LocatorProtocol,
+        PageProtocol,
+    )
+    from .pool import PagePool, PoolStats
+    from .project import Project, get_projects
+    from .schema import Schema
+    from .scroll import ScrollHarvester
+    from .selector import SelectorCache
+    from .store import ContentStore, ItemStore
+    from .stvector import HtmlVector, LazyVector
+    from .trace import OpRecord, Tracer
 
 __all__ = (
     'BaseDataItem',
@@ -17,10 +33,72 @@ __all__ = (
     'BasePageElement',
     'BasePageModel',
     'BrowserProtocol',
+    'CompactHtmlItem',
+    'ContentStore',
+    'CrawlStats',
+    'Crawler',
+    'FakeBrowser',
     'HtmlVector',
+    'IncrementalSchema',
+    'ItemStore',
+    'LazyVector',
     'LocatorProtocol',
+    'MemoryUsage',
+    'OpRecord',
+    'PagePool',
     'PageProtocol',
+    'PoolStats',
     'Project',
+    'Schema',
+    'ScrollHarvester',
+    'SelectorCache',
     'ShapeError',
+    'Tracer',
+    'extract_many',
     'get_projects',
 )
+
+# public names are imported from submodules on first access, to keep
+# `import scrap` from importing lxml and other heavy dependencies
+LAZY_ATTRS = {
+    'BaseDataItem': 'item',
+    'BaseHtmlItem': 'item',
+    'BasePageElement': 'page',
+    'BasePageModel': 'page',
+    'BrowserProtocol': 'page',
+    'CompactHtmlItem': 'item',
+    'ContentStore': 'store',
+    'CrawlStats': 'crawl',
+    'Crawler': 'crawl',
+    'FakeBrowser': 'fake',
+    'HtmlVector': 'stvector',
+    'IncrementalSchema': 'incremental',
+    'ItemStore': 'store',
+    'LazyVector': 'stvector',
+    'LocatorProtocol': 'page',
+    'MemoryUsage': 'memory',
+    'OpRecord': 'trace',
+    'PagePool': 'pool',
+    'PageProtocol': 'page',
+    'PoolStats': 'pool',
+    'Project': 'project',
+    'Schema': 'schema',
+    'ScrollHarvester': 'scroll',
+    'SelectorCache': 'selector',
+    'ShapeError': 'exception',
+    'Tracer': 'trace',
+    'extract_many': 'batch',
+    'get_projects': 'project',
+}
+
+
+def __getattr__(name: str) -> object:
+    if (module := LAZY_ATTRS.get(name)) is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,153 @@
+import os
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, MutableMapping
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    as_completed,
+    wait,
+)
+from itertools import batched
+from multiprocessing.context import BaseContext
+from typing import Any
+from uuid import UUID
+
+from .item import BaseHtmlItem
+from .stvector import ElementBase, HtmlElement, HtmlVector, LazyVector, StVector
+
+type Extractor = Callable[[HtmlVector[HtmlElement]], object] | LazyVector[Any]
+type Pending = tuple[
+    tuple[BaseHtmlItem, ...],  # chunk of items
+    dict[UUID, object],  # results by item iid, initially memoized ones
+    Future[list[tuple[UUID, object]]] | None,  # extraction of other items
+]
+
+_extractor: Extractor | None = None  # set in worker process
+
+
+def extract_many(
+    items: Iterable[BaseHtmlItem],
+    extractor: Extractor,
+    *,
+    workers: int | None = None,
+    chunksize: int = 16,
+    ordered: bool = True,
+    mp_context: BaseContext | None = None,
+    memo: MutableMapping[str, object] | None = None,
+) -> Iterator[tuple[UUID, object]]:
+    """
+    Parse and extract many html items in a process pool, yield `(iid, result)` pairs.
+
+    Extractor is either a picklable function taking item vector or `LazyVector`
+    chain recorded without source. Vector results are converted to nested lists;
+    results must be picklable, so lxml elements must be converted to plain values
+    inside extractor. Items are sent to workers in chunks of `chunksize`, with at
+    most two chunks per worker in flight. Results are yielded in input order
+    unless `ordered=False`.
+
+    When `memo` mapping is given, results are memoized by item `content_hash`, and
+    items with already processed snapshots are not sent to workers. Memo must be
+    specific to extractor, and extractor results must not depend on item url.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = 2 * workers
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=mp_context,
+        initializer=init_worker,
+        initargs=(extractor,),
+    ) as pool:
+
+        def submit(chunk: tuple[BaseHtmlItem, ...]) -> Pending:
+            hits = {}
+            if memo is not None:
+                for item in chunk:
+                    if item.content_hash in memo:
+                        hits[item.iid] = memo[item.content_hash]
+            todo = tuple(item for item in chunk if item.iid not in hits)
+            future = pool.submit(extract_chunk, todo) if todo else None
+            return chunk, hits, future
+
+        def collect(pending: Pending) -> Iterator[tuple[UUID, object]]:
+            chunk, hits, future = pending
+            if future is not None:
+                hits.update(future.result())
+            for item in chunk:
+                result = hits[item.iid]
+                if memo is not None:
+                    memo[item.content_hash] = result
+                yield item.iid, result
+
+        chunks = batched(items, chunksize)
+        if ordered:
+            queue: deque[Pending] = deque()
+            for chunk in chunks:
+                queue.append(submit(chunk))
+                if len(queue) >= max_pending:
+                    yield from collect(queue.popleft())
+            while queue:
+                yield from collect(queue.popleft())
+        else:
+            running: dict[Future[list[tuple[UUID, object]]], Pending] = {}
+            for chunk in chunks:
+                pending = submit(chunk)
+                if pending[2] is None:
+                    yield from collect(pending)
+                    continue
+                running[pending[2]] = pending
+                if len(running) >= max_pending:
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from collect(running.pop(future))
+            for future in as_completed(running):
+                yield from collect(running[future])
+
+
+def extract_item(item: BaseHtmlItem, extractor: Extractor) -> object:
+    """
+    Parse and extract single item, return plain value.
+    """
+    vector = item.get_vector()
+    try:
+        if isinstance(extractor, LazyVector):
+            result: object = extractor.run(vector)
+        else:
+            result = extractor(vector)
+    finally:
+        item.drop_tree()  # items are not reused in worker process
+    if isinstance(result, StVector):
+        result = result.to_list()
+    check_plain(result)
+    return result
+
+
+def check_plain(result: object) -> None:
+    """
+    Raise `TypeError` if result contains lxml elements, which can't be pickled.
+    """
+    if isinstance(result, ElementBase):
+        raise TypeError(
+            f'Extractor result contains {type(result).__name__}, it must be '
+            'converted to plain values, e.g. with text() or detach()'
+        )
+    elif isinstance(result, (list, tuple)):
+        for value in result:
+            check_plain(value)
+    elif isinstance(result, dict):
+        for value in result.values():
+            check_plain(value)
+
+
+# worker process
+
+
+def init_worker(extractor: Extractor) -> None:
+    global _extractor
+    _extractor = extractor
+
+
+def extract_chunk(items: tuple[BaseHtmlItem, ...]) -> list[tuple[UUID, object]]:
+    if _extractor is None:
+        raise RuntimeError('Worker process is not initialized')
+    return [(item.iid, extract_item(item, _extractor)) for item in items]
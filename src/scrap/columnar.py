@@ -0,0 +1,167 @@
+from array import array
+from collections.abc import Callable, Mapping, Sequence
+from datetime import UTC, date, datetime
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from .exception import ShapeError
+
+if TYPE_CHECKING:
+    import numpy as np  # optional dependency, install scrap[numpy]
+    import pyarrow as pa  # optional dependency, install scrap[arrow]
+
+    from .stvector import StVector
+
+    type DTypeLike = np.dtype[Any] | str | type
+
+type Offsets = tuple[array[int], ...]
+
+INT32_MAX = 2**31 - 1
+
+
+class Columnar(NamedTuple):
+    """
+    Columnar representation of structured vector: typed bottom level values,
+    validity mask (`False` for null values), and one int64 offsets array per level,
+    sharing memory with vector offsets.
+    """
+
+    values: 'np.ndarray[Any, np.dtype[Any]]'
+    validity: 'np.ndarray[Any, np.dtype[np.bool_]]'
+    offsets: 'tuple[np.ndarray[Any, np.dtype[np.int64]], ...]'
+
+
+def to_masked_array(
+    values: Sequence[object],
+    dtype: 'DTypeLike | None' = None,
+) -> 'np.ma.MaskedArray[Any, np.dtype[Any]]':
+    """
+    Convert flat sequence of values to typed NumPy masked array; `None` values
+    are masked. When `dtype` is not specified, it is inferred from the first
+    non-null value.
+    """
+    import numpy as np  # optional dependency, install scrap[numpy]
+
+    count = len(values)
+    mask = np.fromiter((v is None for v in values), dtype=np.bool_, count=count)
+    if dtype is None:
+        dtype = infer_dtype(next((v for v in values if v is not None), None))
+    dtype = np.dtype(dtype)
+    convert, fill = CONVERTERS.get(dtype.kind, (None, None))
+    if convert is None:
+        data = np.fromiter(
+            (fill if v is None else v for v in values), dtype=dtype, count=count
+        )
+    else:
+        data = np.fromiter(
+            (fill if v is None else convert(v) for v in values),
+            dtype=dtype,
+            count=count,
+        )
+    return np.ma.MaskedArray(data, mask=mask)
+
+
+def to_columnar(
+    values: Sequence[object],
+    offsets: Offsets,
+    dtype: 'DTypeLike | None' = None,
+) -> Columnar:
+    """
+    Convert vector buffers to NumPy arrays.
+    """
+    import numpy as np  # optional dependency, install scrap[numpy]
+
+    masked = to_masked_array(values, dtype)
+    return Columnar(
+        values=masked.data,
+        validity=~np.ma.getmaskarray(masked),
+        offsets=tuple(np.frombuffer(o, dtype=np.int64) for o in offsets),
+    )
+
+
+def to_arrow(
+    values: Sequence[object],
+    offsets: Offsets,
+    type: 'pa.DataType | None' = None,
+) -> 'pa.Array':
+    """
+    Convert vector buffers to Arrow array with one item per top level item; lower
+    levels become nested list arrays, with 64-bit offsets when 32-bit are not
+    enough. Scalar vector becomes array of single item.
+    """
+    import pyarrow as pa  # optional dependency, install scrap[arrow]
+
+    ret = pa.array(values, type=type)
+    for level_offsets in reversed(offsets[1:]):
+        # int64 offsets buffer is shared without copying
+        buffer = pa.py_buffer(level_offsets)
+        arrow_offsets = pa.Array.from_buffers(
+            pa.int64(), len(level_offsets), [None, buffer]
+        )
+        if level_offsets[-1] > INT32_MAX:
+            ret = pa.LargeListArray.from_arrays(arrow_offsets, ret)
+        else:
+            ret = pa.ListArray.from_arrays(arrow_offsets.cast(pa.int32()), ret)
+    return ret
+
+
+def to_arrow_table(
+    columns: 'Mapping[str, StVector[Any]]',
+    types: 'Mapping[str, pa.DataType] | None' = None,
+) -> 'pa.Table':
+    """
+    Combine vectors with the same number of top level items into Arrow table, one
+    row per top level item.
+    """
+    import pyarrow as pa  # optional dependency, install scrap[arrow]
+
+    types = types or {}
+    arrays = {
+        name: to_arrow(vec.values, vec.offsets, types.get(name))
+        for name, vec in columns.items()
+    }
+    if len({len(arr) for arr in arrays.values()}) > 1:
+        raise ShapeError('Columns have different number of rows')
+    return pa.table(arrays)
+
+
+# helpers
+
+
+def infer_dtype(value: object) -> 'DTypeLike':
+    # order matters: bool is int, datetime is date
+    if isinstance(value, bool):
+        return 'bool'
+    elif isinstance(value, int):
+        return 'int64'
+    elif isinstance(value, float):
+        return 'float64'
+    elif isinstance(value, datetime):
+        return 'datetime64[us]'
+    elif isinstance(value, date):
+        return 'datetime64[D]'
+    elif isinstance(value, str):
+        return 'T'  # variable-width string
+    else:
+        return 'O'
+
+
+def naive_utc(value: date) -> date:
+    """
+    NumPy datetimes are timezone-naive; convert aware datetimes to UTC.
+    """
+    if not isinstance(value, datetime) or value.tzinfo is None:
+        return value
+    return value.astimezone(UTC).replace(tzinfo=None)
+
+
+# dtype kind -> (value converter, fill value for masked items)
+CONVERTERS: dict[str, tuple[Callable[[Any], Any] | None, object]] = {
+    'b': (None, False),
+    'i': (None, 0),
+    'u': (None, 0),
+    'f': (None, float('nan')),
+    'M': (naive_utc, None),  # None becomes NaT
+    'T': (str, ''),
+    'U': (str, ''),
+    'O': (None, None),
+}
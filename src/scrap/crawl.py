@@ -0,0 +1,260 @@
+import asyncio
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from heapq import heappop, heappush
+from itertools import count
+from time import monotonic
+from typing import Any
+
+from yarl import URL
+
+from .item import BaseHtmlItem
+from .page import PageProtocol
+from .pool import PagePool
+
+type Navigate = Callable[[PageProtocol, str], Awaitable[None]]
+
+
+@dataclass(order=True, slots=True)
+class CrawlRequest:
+    """
+    Queued url; requests with lower `priority` are fetched first, then in order
+    of addition.
+    """
+
+    priority: float
+    seq: int
+    url: str = field(compare=False)
+    host: str = field(compare=False)
+    attempt: int = field(default=0, compare=False)
+
+
+@dataclass(slots=True)
+class HostState:
+    queue: list[CrawlRequest] = field(default_factory=list)  # heap
+    active: int = 0
+    next_start: float = 0.0  # monotonic time, for rate limit
+
+
+@dataclass(slots=True)
+class CrawlStats:
+    queued: int = 0
+    fetched: int = 0
+    retried: int = 0
+    failed: int = 0
+
+
+class Crawler[I: BaseHtmlItem]:
+    """
+    Asyncio crawl scheduler streaming page snapshots.
+
+    Urls are fetched with pages of `pool`, so global concurrency is limited by
+    pool size, and at most `per_host` requests run against the same host, started
+    at most `rate` times per second. Failed requests are retried up to `retries`
+    times with exponential backoff, then reported in `errors`.
+
+    Items are created with `item_type.from_page()` after `navigate` coroutine,
+    which defaults to `page.goto_url(url)`. Finished items are buffered in queue
+    of size `buffer`: when consumer is slow, fetching pauses until it catches up.
+    """
+
+    def __init__(
+        self,
+        pool: PagePool,
+        item_type: type[I],
+        *,
+        per_host: int = 2,
+        rate: float | None = None,
+        retries: int = 2,
+        retry_delay: float = 1.0,
+        buffer: int = 64,
+        max_queued: int = 10_000,
+        navigate: Navigate | None = None,
+        **item_kwargs: Any,
+    ) -> None:
+        if per_host < 1:
+            raise ValueError(f'Invalid per host concurrency {per_host}')
+        if rate is not None and rate <= 0:
+            raise ValueError(f'Invalid rate {rate}')
+        self.pool = pool
+        self.item_type = item_type
+        self.per_host = per_host
+        self.interval = 1 / rate if rate is not None else 0.0
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.buffer = buffer
+        self.max_queued = max_queued
+        self.navigate = navigate or goto
+        self.item_kwargs = item_kwargs
+        self.stats = CrawlStats()
+        self.errors: dict[str, Exception] = {}  # last error of failed urls
+        self._hosts: dict[str, HostState] = {}
+        self._delayed: list[tuple[float, CrawlRequest]] = []  # retries, heap
+        self._seq = count()
+        self._queued = 0
+        self._active = 0
+        self._feeding = False
+        self._changed = asyncio.Event()
+
+    def add(self, url: str, priority: float = 0) -> None:
+        """
+        Add url to queue; urls added during crawl are fetched before it ends.
+        """
+        self._push(CrawlRequest(priority, next(self._seq), url, host_of(url)))
+        self.stats.queued += 1
+
+    async def crawl(
+        self,
+        urls: Iterable[str] | AsyncIterable[str] = (),
+    ) -> AsyncIterator[I]:
+        """
+        Fetch queued urls and urls from `urls` stream, yield items in order of
+        completion. Stream is consumed lazily, keeping at most `max_queued` urls
+        in queue.
+        """
+        results: asyncio.Queue[I | None] = asyncio.Queue(self.buffer)
+        self._feeding = True
+        tasks = [
+            asyncio.create_task(self._feed(urls)),
+            *(asyncio.create_task(self._work(results)) for _ in range(self.pool.size)),
+        ]
+        done = asyncio.create_task(self._finish(tasks, results))
+        try:
+            while (item := await results.get()) is not None:
+                yield item
+            await done  # raise unexpected errors of feeder and workers
+        finally:
+            for task in (*tasks, done):
+                task.cancel()
+            await asyncio.gather(*tasks, done, return_exceptions=True)
+            self._feeding = False
+
+    async def _feed(self, urls: Iterable[str] | AsyncIterable[str]) -> None:
+        try:
+            if isinstance(urls, AsyncIterable):
+                async for url in urls:
+                    await self._wait_queue()
+                    self.add(url)
+            else:
+                for url in urls:
+                    await self._wait_queue()
+                    self.add(url)
+        finally:
+            self._feeding = False
+            self._notify()
+
+    async def _wait_queue(self) -> None:
+        while self._queued >= self.max_queued:
+            await self._wait(None)
+
+    async def _work(self, results: asyncio.Queue[I | None]) -> None:
+        while (req := await self._next()) is not None:
+            item: I | None = None
+            try:
+                item = await self._fetch(req.url)
+            except Exception as exc:
+                self._retry(req, exc)
+            finally:
+                self._hosts[req.host].active -= 1
+                self._active -= 1
+                self._notify()
+            if item is not None:
+                self.stats.fetched += 1
+                await results.put(item)
+
+    async def _finish(
+        self,
+        tasks: list[asyncio.Task[None]],
+        results: asyncio.Queue[I | None],
+    ) -> None:
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            await results.put(None)
+
+    async def _fetch(self, url: str) -> I:
+        async with self.pool.page() as page:
+            await self.navigate(page, url)
+            return await self.item_type.from_page(page, **self.item_kwargs)
+
+    async def _next(self) -> CrawlRequest | None:
+        """
+        Wait for request allowed by host limits, or return None when all done.
+        """
+        while True:
+            now = monotonic()
+            req, wake = self._pop_ready(now)
+            if req is not None:
+                host = self._hosts[req.host]
+                host.active += 1
+                host.next_start = now + self.interval
+                self._active += 1
+                self._notify()  # feeder may be waiting for free queue space
+                return req
+            if not self._queued and not self._active and not self._feeding:
+                return None
+            await self._wait(wake)
+
+    def _pop_ready(self, now: float) -> tuple[CrawlRequest | None, float | None]:
+        """
+        Pop best request among hosts below limits, and get time to wait otherwise.
+        """
+        while self._delayed and self._delayed[0][0] <= now:
+            self._queued -= 1
+            self._push(heappop(self._delayed)[1])
+        wake = self._delayed[0][0] - now if self._delayed else None
+        best: HostState | None = None
+        for name, host in list(self._hosts.items()):
+            if not host.queue:
+                if not host.active and host.next_start <= now:
+                    del self._hosts[name]
+                continue
+            if host.active >= self.per_host:
+                continue
+            if host.next_start > now:
+                delay = host.next_start - now
+                wake = delay if wake is None else min(wake, delay)
+                continue
+            if best is None or host.queue[0] < best.queue[0]:
+                best = host
+        if best is None:
+            return None, wake
+        self._queued -= 1
+        return heappop(best.queue), None
+
+    def _push(self, req: CrawlRequest) -> None:
+        host = self._hosts.setdefault(req.host, HostState())
+        heappush(host.queue, req)
+        self._queued += 1
+        self._notify()
+
+    def _retry(self, req: CrawlRequest, exc: Exception) -> None:
+        if req.attempt >= self.retries:
+            self.stats.failed += 1
+            self.errors[req.url] = exc
+            return
+        self.stats.retried += 1
+        req.attempt += 1
+        delay = self.retry_delay * 2 ** (req.attempt - 1)
+        heappush(self._delayed, (monotonic() + delay, req))
+        self._queued += 1
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def _wait(self, timeout: float | None) -> None:
+        changed = self._changed
+        try:
+            async with asyncio.timeout(timeout):
+                await changed.wait()
+        except TimeoutError:
+            pass
+
+
+async def goto(page: PageProtocol, url: str) -> None:
+    await page.goto_url(url)
+
+
+def host_of(url: str) -> str:
+    return URL(url).host or ''
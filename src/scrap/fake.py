@@ -0,0 +1,182 @@
+import asyncio
+import random
+import re
+from collections.abc import Callable, Mapping
+from fnmatch import fnmatchcase
+from os import PathLike
+from pathlib import Path
+from time import monotonic
+
+from yarl import URL
+
+from .page import PageProtocol
+
+type Content = str | Callable[[int], str]  # html, or html by scroll position
+type Latency = float | tuple[float, float]
+
+
+class FakePage:
+    """
+    In-process page of `FakeBrowser`. Scroll position is a number of pages
+    scrolled down, and is passed to callable page sources to simulate lazy loading.
+    """
+
+    def __init__(self, browser: 'FakeBrowser') -> None:
+        self.browser: object = browser
+        self.owner = browser
+        self.url = 'about:blank'
+        self.position = 0
+        self.closed = False
+
+    # navigation and lifecycle
+
+    async def goto_blank(self) -> None:
+        self.url = 'about:blank'
+        self.position = 0
+
+    async def goto_url(self, url: str) -> None:
+        await self.owner.navigate(url)
+        self.url = url
+        self.position = 0
+
+    async def close(self) -> None:
+        await self.owner.close_page(self)
+
+    # accessors
+
+    async def get_content(self) -> str:
+        if self.url == 'about:blank':
+            return '<html><head></head><body></body></html>'
+        content = self.owner.lookup(self.url)
+        return content if isinstance(content, str) else content(self.position)
+
+    async def get_url(self) -> str:
+        return self.url
+
+    # scrolling
+
+    async def scroll_top(self) -> None:
+        self.position = 0
+
+    async def scroll_bottom(self) -> None:
+        self.position = self.owner.max_scroll
+
+    async def scroll_page_up(self, num: int = 1) -> None:
+        self.position = max(self.position - num, 0)
+
+    async def scroll_page_down(self, num: int = 1) -> None:
+        self.position = min(self.position + num, self.owner.max_scroll)
+
+    # conditions and delays
+
+    async def expect_url(
+        self,
+        pattern: str | re.Pattern[str],
+        retry_delay: int | float = 100,
+    ) -> None:
+        """
+        Wait until page url matches regex or glob pattern, or raise `TimeoutError`
+        after browser `timeout`.
+        """
+        deadline = monotonic() + self.owner.timeout / 1000
+        while not match_url(self.url, pattern):
+            if monotonic() >= deadline:
+                raise TimeoutError(f'Page url {self.url} does not match {pattern}')
+            await self.sleep(retry_delay)
+
+    async def sleep(self, timeout: int | float) -> None:
+        await asyncio.sleep(timeout / 1000)
+
+
+class FakeBrowser:
+    """
+    In-process browser serving html from mapping or directory, for tests and load
+    testing without real browser.
+
+    Mapping keys are urls or url paths; in directory, url path is file path, and
+    paths ending with slash are served from `index.html`; files are decoded as
+    UTF-8. Mapping values can be callables returning html for scroll position, to
+    simulate infinite scroll. Navigation takes `latency` milliseconds, or random
+    time from range. Times are in milliseconds, like in `PageProtocol`.
+    """
+
+    def __init__(
+        self,
+        source: Mapping[str, Content] | str | PathLike[str],
+        latency: Latency = 0,
+        max_scroll: int = 100,
+        timeout: float = 1000,
+        seed: int | None = None,
+    ) -> None:
+        if isinstance(source, Mapping):
+            self.root: Path | None = None
+            self.content: dict[str, Content] = dict(source)
+        else:
+            self.root = Path(source)
+            self.content = {}  # files are read once
+        self.latency = latency
+        self.max_scroll = max_scroll
+        self.timeout = timeout
+        self.requests = 0
+        self.page: PageProtocol | None = None
+        self.pages: list[PageProtocol] = []
+        self._random = random.Random(seed)  # noqa: S311
+
+    async def open_page(self) -> PageProtocol:
+        page = FakePage(self)
+        self.pages.append(page)
+        self.page = page
+        return page
+
+    async def close_page(self, page: int | PageProtocol) -> None:
+        if isinstance(page, int):
+            page = self.pages[page]
+        if page in self.pages:
+            self.pages.remove(page)
+        if isinstance(page, FakePage):
+            page.closed = True
+        if self.page is page:
+            self.page = self.pages[-1] if self.pages else None
+
+    def page_index(self, page: PageProtocol) -> int | None:
+        return self.pages.index(page) if page in self.pages else None
+
+    def lookup(self, url: str) -> Content:
+        """
+        Get page source by url, or raise `LookupError`.
+        """
+        if (content := self.content.get(url)) is not None:
+            return content
+        path = URL(url).path or '/'
+        if (content := self.content.get(path)) is not None:
+            return content
+        if self.root is not None:
+            file = self.root / (
+                path.lstrip('/') + ('index.html' if path.endswith('/') else '')
+            )
+            if file.resolve().is_relative_to(self.root.resolve()) and file.is_file():
+                content = self.content[path] = file.read_text(encoding='utf-8')
+                return content
+        raise LookupError(f'Page not found: {url}')
+
+    async def navigate(self, url: str) -> None:
+        """
+        Simulate page load: wait for latency and check that url exists. Override
+        to record visits or to fail navigation.
+        """
+        await self.delay()
+        self.lookup(url)  # fail early on unknown urls
+        self.requests += 1
+
+    async def delay(self) -> None:
+        if isinstance(self.latency, tuple):
+            latency = self._random.uniform(*self.latency)
+        else:
+            latency = self.latency
+        await asyncio.sleep(latency / 1000)
+
+
+def match_url(url: str, pattern: str | re.Pattern[str]) -> bool:
+    if isinstance(pattern, re.Pattern):
+        return pattern.search(url) is not None
+    return fnmatchcase(url, pattern)
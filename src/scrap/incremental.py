@@ -0,0 +1,84 @@
+import hashlib
+from typing import Any, NamedTuple
+
+from lxml.etree import ElementBase, tostring
+
+from .cache import LRUCache
+from .memory import detach_value, outer_html
+from .schema import Schema
+from .stvector import StVector
+
+DEFAULT_MAXSIZE = 100_000
+
+
+class SnapshotDiff(NamedTuple):
+    """
+    Row subtree hashes present only in old or only in new snapshot.
+    """
+
+    added: frozenset[bytes]
+    removed: frozenset[bytes]
+    unchanged: frozenset[bytes]
+
+
+class IncrementalSchema:
+    """
+    Schema evaluation reusing results of rows unchanged since previous snapshots.
+
+    Every row subtree is hashed, and records are memoized by hash in size-bounded
+    cache, shared between pages. On re-crawl, only rows with changed subtrees are
+    extracted, so work is proportional to what changed. Field chains must depend
+    on row subtree only, and not on ancestors or siblings of row element.
+    Cached records keep plain values only, so element fields are returned as
+    outer html.
+    """
+
+    def __init__(self, schema: Schema, maxsize: int | None = DEFAULT_MAXSIZE) -> None:
+        self.schema = schema
+        self.cache: LRUCache[bytes, dict[str, Any]] = LRUCache(maxsize)
+
+    def run(self, vector: StVector[Any]) -> list[dict[str, Any]]:
+        """
+        Evaluate schema, return one record per row.
+        """
+        rows = self.schema.select_rows(vector)
+        hashes = [subtree_hash(row) for row in rows.values]
+        records: list[dict[str, Any] | None] = [self.cache.get(h) for h in hashes]
+        missing = [i for i, rec in enumerate(records) if rec is None]
+        if missing:
+            changed = rows[missing] if len(missing) < len(rows) else rows
+            for i, rec in zip(missing, self.schema.row_records(changed), strict=True):
+                # cached records must not keep source documents alive
+                records[i] = rec = plain_record(rec)
+                self.cache.put(hashes[i], rec)
+        # records are copied so that callers can't modify cached values
+        return [plain_record(rec) for rec in records]  # type: ignore[arg-type]
+
+    def diff(self, old: StVector[Any], new: StVector[Any]) -> SnapshotDiff:
+        """
+        Compare row subtrees of two snapshots.
+        """
+        old_hashes = {subtree_hash(r) for r in self.schema.select_rows(old).values}
+        new_hashes = {subtree_hash(r) for r in self.schema.select_rows(new).values}
+        return SnapshotDiff(
+            added=frozenset(new_hashes - old_hashes),
+            removed=frozenset(old_hashes - new_hashes),
+            unchanged=frozenset(old_hashes & new_hashes),
+        )
+
+
+def plain_record(record: dict[str, Any]) -> dict[str, Any]:
+    """
+    Copy record with nested lists, replacing lxml smart strings with plain strings
+    and elements with outer html.
+    """
+    return {name: detach_value(value, outer_html) for name, value in record.items()}
+
+
+def subtree_hash(elem: ElementBase) -> bytes:
+    """
+    Get hash of element with all descendants, excluding text after element.
+    """
+    if not isinstance(elem, ElementBase):
+        raise TypeError(f'Required ElementBase instead of {type(elem)}')
+    return hashlib.blake2b(tostring(elem, with_tail=False), digest_size=16).digest()
@@ -1,12 +1,18 @@
-from dataclasses import dataclass, field
+import hashlib
+import importlib
+import sys
+import zlib
+from dataclasses import dataclass, field, fields
 from datetime import UTC, datetime
-from typing import Any, Self
+from types import ModuleType
+from typing import Any, ClassVar, Self
 from uuid import UUID
 
 import lxml.etree
 from uuid6 import uuid7
 from yarl import URL
 
+from .cache import LRUCache
 from .page import BasePageModel, PageProtocol
 from .stvector import HtmlElement, HtmlVector
 
@@ -18,16 +24,54 @@ def utcnow(microsecond: bool = True) -> datetime:
     return dtm
 
 
-@dataclass
+@dataclass(slots=True, weakref_slot=True)
 class BaseDataItem:
     iid: UUID = field(default_factory=uuid7)
     created_at: datetime = field(default_factory=utcnow)
 
 
-@dataclass(kw_only=True)
-class BaseHtmlItem(BaseDataItem):
+class TreeSlot(BaseDataItem):
+    """
+    Slot for memoized parsed tree, declared outside of dataclass, so that the tree
+    is not returned by `fields()`, `asdict()` and `astuple()`.
+    """
+
+    __slots__ = ('_tree',)
+
+    _tree: HtmlElement | None
+
+
+@dataclass(kw_only=True, slots=True)
+class BaseHtmlItem(TreeSlot):
     url: str  # this is needed to provide base_url when parsing html string
     html: str = field(repr=False)
+    content_hash: str = field(init=False, repr=False, compare=False)
+
+    # fields that are not pickled or copied
+    transient_fields: ClassVar[frozenset[str]] = frozenset()
+
+    # optional cache of parsed trees shared between items with the same content,
+    # e.g. LRUCache(128); disabled by default, so trees are freed with items
+    tree_cache: ClassVar[LRUCache[tuple[str, str], HtmlElement] | None] = None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in ('url', 'html'):
+            self.drop_tree()
+        if name == 'html':
+            object.__setattr__(self, 'content_hash', hash_content(value))
+        # zero-argument super() is not available in slotted dataclasses
+        object.__setattr__(self, name, value)
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {
+            f.name: getattr(self, f.name)
+            for f in fields(self)
+            if f.name not in self.transient_fields
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
 
     @classmethod
     def from_etree(cls, url: str, element: HtmlElement, **kwargs: Any) -> Self:
@@ -41,4 +85,119 @@ class BaseHtmlItem(BaseDataItem):
         return cls(url=await page.get_url(), html=await page.get_content(), **kwargs)
 
     def get_vector(self) -> HtmlVector[HtmlElement]:
-        return HtmlVector.from_string(self.html, base_url=URL(self.url).with_path(''))
+        """
+        Get vector of parsed html; parsed tree is memoized in item until `url` or
+        `html` is changed, or `drop_tree()` is called. Vectors of the same item
+        share the tree.
+        """
+        if (tree := getattr(self, '_tree', None)) is None:  # slot is set lazily
+            base_url = str(URL(self.url).with_path(''))
+            key = (self.content_hash, base_url)
+            cache = self.tree_cache
+            if cache is None or (tree := cache.get(key)) is None:
+                tree = HtmlVector.from_string(self.html, base_url=base_url).scalar()
+                if cache is not None:
+                    cache.put(key, tree)
+            object.__setattr__(self, '_tree', tree)
+        return HtmlVector(tree)
+
+    def drop_tree(self) -> None:
+        """
+        Release memoized parsed tree.
+        """
+        object.__setattr__(self, '_tree', None)
+
+
+@dataclass(kw_only=True, slots=True)
+class CompactHtmlItem(BaseHtmlItem):
+    """
+    Html item keeping page compressed with zstd (Python 3.14+ or `zstandard`
+    package) or zlib, and url origin interned. Both `html` and `url` are restored
+    on access.
+    """
+
+    url_origin: str = field(init=False, repr=False, compare=False)
+    url_rest: str = field(init=False, repr=False, compare=False)
+    html_data: bytes = field(init=False, repr=False, compare=False)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # url and html slots are never set, reading them falls back to __getattr__
+        if name == 'html':
+            self.drop_tree()
+            object.__setattr__(self, 'content_hash', hash_content(value))
+            object.__setattr__(self, 'html_data', compress_text(value))
+        elif name == 'url':
+            self.drop_tree()
+            origin, rest = split_url_origin(value)
+            object.__setattr__(self, 'url_origin', sys.intern(origin))
+            object.__setattr__(self, 'url_rest', rest)
+        else:
+            object.__setattr__(self, name, value)
+
+    def __getattr__(self, name: str) -> Any:
+        if name == 'html':
+            return decompress_text(self.html_data)
+        elif name == 'url':
+            return self.url_origin + self.url_rest
+        raise AttributeError(
+            f'{self.__class__.__name__!r} object has no attribute {name!r}'
+        )
+
+    # url and html slots are never set, pickled state would restore decompressed html
+    transient_fields: ClassVar[frozenset[str]] = frozenset({'url', 'html'})
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        state['url_origin'] = sys.intern(state['url_origin'])
+        BaseHtmlItem.__setstate__(self, state)
+
+
+# helpers
+
+
+def hash_content(text: str) -> str:
+    """
+    Get content hash of html body, used to deduplicate snapshots.
+    """
+    return hashlib.blake2b(
+        text.encode('utf-8', 'surrogatepass'), digest_size=16
+    ).hexdigest()
+
+
+def find_zstd() -> ModuleType | None:
+    # both modules provide compatible compress() and decompress()
+    for name in ('compression.zstd', 'zstandard'):
+        try:
+            return importlib.import_module(name)
+        except ImportError:
+            continue
+    return None
+
+
+zstd = find_zstd()
+
+
+def compress_text(text: str) -> bytes:
+    data = text.encode('utf-8', 'surrogatepass')  # page content may have them
+    if zstd is not None:
+        return b's' + zstd.compress(data)  # type: ignore[no-any-return]
+    return b'z' + zlib.compress(data)
+
+
+def decompress_text(data: bytes) -> str:
+    codec, payload = data[:1], data[1:]
+    if codec == b'z':
+        return zlib.decompress(payload).decode('utf-8', 'surrogatepass')
+    elif codec == b's':
+        if zstd is None:
+            raise RuntimeError('zstd support is required to decompress data')
+        return zstd.decompress(payload).decode('utf-8', 'surrogatepass')  # type: ignore[no-any-return]
+    raise ValueError(f'Unknown compression codec {codec!r}')
+
+
+def split_url_origin(url: str) -> tuple[str, str]:
+    """
+    Split url into origin (scheme and authority) and the rest.
+    """
+    start = url.find('://')
+    pos = url.find('/', start + 3) if start >= 0 else -1
+    return (url, '') if pos < 0 else (url[:pos], url[pos:])
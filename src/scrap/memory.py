@@ -0,0 +1,109 @@
+import sys
+from array import array
+from collections.abc import Callable, Iterable, Sequence
+from typing import NamedTuple
+
+from lxml.etree import _Element, _ElementUnicodeResult, tostring
+
+type Offsets = tuple[array[int], ...]
+
+# approximate sizes of libxml2 structures on 64-bit platforms
+NODE_SIZE = 120  # xmlNode, used for elements and text nodes
+ATTR_SIZE = 96  # xmlAttr, with value stored in separate text node
+
+
+class MemoryUsage(NamedTuple):
+    """
+    Approximate memory held by vector, in bytes: own buffers and plain values,
+    and parsed documents kept alive by element and smart string leaves.
+    """
+
+    vector: int
+    documents: int
+    trees: int  # number of distinct documents
+
+    @property
+    def total(self) -> int:
+        return self.vector + self.documents
+
+
+def memory_usage(
+    values: Sequence[object],
+    offsets: Offsets,
+    index: array[int] | None = None,
+) -> MemoryUsage:
+    """
+    Estimate memory of vector buffers, leaf values and documents of leaves.
+    Shared values are counted once, element leaves are counted as documents.
+    """
+    size = sys.getsizeof(values) + sum(sys.getsizeof(a) for a in offsets)
+    if index is not None:
+        size += sys.getsizeof(index)
+        values = [values[i] for i in index]
+    seen: set[int] = set()
+    roots: dict[int, _Element] = {}
+    for value in values:
+        if (root := leaf_root(value)) is not None:
+            roots.setdefault(id(root), root)
+        if isinstance(value, _Element) or id(value) in seen:
+            continue
+        seen.add(id(value))
+        size += sys.getsizeof(value)
+    documents = sum(tree_size(root) for root in roots.values())
+    return MemoryUsage(vector=size, documents=documents, trees=len(roots))
+
+
+def tree_size(root: _Element) -> int:
+    """
+    Estimate memory of lxml tree from number of nodes and length of strings.
+    """
+    size = 0
+    for elem in root.iter():
+        size += NODE_SIZE
+        if isinstance(elem.tag, str):
+            size += len(elem.tag)
+        for text in (elem.text, elem.tail):
+            if text:
+                size += NODE_SIZE + len(text)
+        for name, value in elem.items():
+            size += ATTR_SIZE + NODE_SIZE + len(name) + len(value)
+    return size
+
+
+def leaf_root(value: object) -> _Element | None:
+    """
+    Get root element of document referenced by leaf value, if any.
+    """
+    if isinstance(value, _Element):
+        elem: _Element | None = value
+    elif isinstance(value, _ElementUnicodeResult):
+        elem = value.getparent()  # smart strings reference their parent
+    else:
+        return None
+    return None if elem is None else elem.getroottree().getroot()
+
+
+def detach_values(
+    values: Iterable[object],
+    func: Callable[[_Element], object] | None = None,
+) -> list[object]:
+    """
+    Replace element leaves with `func(element)`, outer html by default, and smart
+    strings with plain strings, so that values don't reference lxml trees.
+    """
+    func = func or outer_html
+    return [detach_value(value, func) for value in values]
+
+
+def detach_value(value: object, func: Callable[[_Element], object]) -> object:
+    if isinstance(value, _Element):
+        return func(value)
+    elif isinstance(value, _ElementUnicodeResult):
+        return str(value)
+    elif isinstance(value, list):
+        return [detach_value(v, func) for v in value]
+    return value
+
+
+def outer_html(elem: _Element) -> str:
+    return tostring(elem, encoding='unicode', with_tail=False)
@@ -0,0 +1,159 @@
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass
+from time import perf_counter
+from types import TracebackType
+from typing import Self
+
+from .page import BrowserProtocol, PageProtocol
+
+
+@dataclass(slots=True)
+class PoolStats:
+    """
+    Page pool counters; times are in seconds.
+    """
+
+    size: int
+    acquired: int = 0
+    opened: int = 0
+    retired: int = 0
+    errors: int = 0
+    in_use: int = 0
+    wait_time: float = 0.0  # total time spent waiting for free slot
+    max_wait_time: float = 0.0
+    busy_time: float = 0.0  # total time pages were handed out
+    started_at: float = 0.0
+
+    @property
+    def mean_wait_time(self) -> float:
+        return self.wait_time / self.acquired if self.acquired else 0.0
+
+    @property
+    def utilization(self) -> float:
+        """
+        Share of pool capacity used since pool start, from 0 to 1.
+        """
+        elapsed = perf_counter() - self.started_at
+        return self.busy_time / (self.size * elapsed) if elapsed > 0 else 0.0
+
+
+class PagePool:
+    """
+    Asyncio pool of browser pages with concurrency limit.
+
+    At most `size` pages are handed out at once, other requests wait. Released
+    pages are recycled with `goto_blank()` instead of being closed, and retired
+    after `max_uses` uses or when an error occurs while page is in use.
+    """
+
+    def __init__(
+        self,
+        browser: BrowserProtocol,
+        size: int = 4,
+        max_uses: int | None = 100,
+    ) -> None:
+        if size < 1:
+            raise ValueError(f'Invalid pool size {size}')
+        self.browser = browser
+        self.size = size
+        self.max_uses = max_uses
+        self.stats = PoolStats(size=size, started_at=perf_counter())
+        self._slots = asyncio.Semaphore(size)
+        self._idle: deque[PageProtocol] = deque()
+        self._uses: dict[int, int] = {}  # page id -> number of uses
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[PageProtocol]:
+        """
+        Get page for the duration of `async with` block; page is retired if block
+        raises exception.
+        """
+        page = await self.acquire()
+        start = perf_counter()
+        try:
+            yield page
+        except BaseException:
+            await self.release(page, error=True, busy=perf_counter() - start)
+            raise
+        await self.release(page, busy=perf_counter() - start)
+
+    async def acquire(self) -> PageProtocol:
+        """
+        Wait for free slot and get idle page, or open new one.
+        """
+        start = perf_counter()
+        await self._slots.acquire()
+        wait = perf_counter() - start
+        self.stats.acquired += 1
+        self.stats.wait_time += wait
+        self.stats.max_wait_time = max(self.stats.max_wait_time, wait)
+        try:
+            page = self._idle.pop() if self._idle else await self._open()
+        except BaseException:
+            self._slots.release()
+            raise
+        self._uses[id(page)] += 1
+        self.stats.in_use += 1
+        return page
+
+    async def release(
+        self,
+        page: PageProtocol,
+        error: bool = False,
+        busy: float = 0.0,
+    ) -> None:
+        """
+        Return page to pool, recycle or retire it.
+        """
+        self.stats.in_use -= 1
+        self.stats.busy_time += busy
+        try:
+            uses = self._uses[id(page)]
+            if error:
+                self.stats.errors += 1
+            if error or (self.max_uses is not None and uses >= self.max_uses):
+                await self._retire(page)
+                return
+            try:
+                await page.goto_blank()
+            except Exception:
+                self.stats.errors += 1
+                await self._retire(page)
+                return
+            self._idle.append(page)
+        finally:
+            self._slots.release()
+
+    async def close(self) -> None:
+        """
+        Close all idle pages; pages in use are closed when released.
+        """
+        self.max_uses = 0
+        while self._idle:
+            await self._retire(self._idle.pop())
+
+    async def _open(self) -> PageProtocol:
+        page = await self.browser.open_page()
+        self._uses[id(page)] = 0
+        self.stats.opened += 1
+        return page
+
+    async def _retire(self, page: PageProtocol) -> None:
+        self._uses.pop(id(page), None)
+        self.stats.retired += 1
+        with suppress(Exception):  # page may already be broken
+            await self.browser.close_page(page)
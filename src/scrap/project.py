@@ -1,4 +1,8 @@
-from importlib.metadata import entry_points
+from collections.abc import Iterable
+from importlib.metadata import EntryPoint, entry_points
+from threading import Lock
+
+ENTRY_POINT_GROUP = 'scrap.project'
 
 
 class Project:
@@ -7,12 +11,75 @@ class Project:
     """
 
 
-def get_projects(only: type = Project) -> tuple[tuple[str, type[Project]], ...]:
+class ProjectRegistry:
+    """
+    Registry of projects declared with entry points. Entry points are scanned once,
+    and project classes are loaded on first request and cached; call `clear()` to
+    rescan after installing packages.
+    """
+
+    def __init__(self, group: str = ENTRY_POINT_GROUP) -> None:
+        self.group = group
+        self._entry_points: dict[str, EntryPoint] | None = None
+        self._classes: dict[str, type[Project]] = {}
+        self._lock = Lock()
+
+    def names(self) -> tuple[str, ...]:
+        """
+        Get names of all declared projects without loading them.
+        """
+        return tuple(self._get_entry_points())
+
+    def get(self, name: str) -> type[Project]:
+        """
+        Get project class by name, load it on first request.
+        """
+        if (project_class := self._classes.get(name)) is None:
+            entry_point = self._get_entry_points()[name]
+            project_class = entry_point.load()
+            self._classes[name] = project_class
+        return project_class
+
+    def projects(
+        self,
+        only: type = Project,
+        names: Iterable[str] | None = None,
+    ) -> tuple[tuple[str, type[Project]], ...]:
+        """
+        Get projects, optionally filtered by superclass; when `names` are given,
+        other projects are not loaded.
+        """
+        selected = self.names() if names is None else names
+        return tuple(
+            (name, project_class)
+            for name in selected
+            if issubclass((project_class := self.get(name)), only)
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entry_points = None
+            self._classes.clear()
+
+    def _get_entry_points(self) -> dict[str, EntryPoint]:
+        if self._entry_points is None:
+            with self._lock:
+                if self._entry_points is None:
+                    self._entry_points = {
+                        ep.name: ep for ep in entry_points(group=self.group)
+                    }
+        return self._entry_points
+
+
+registry = ProjectRegistry()
+
+
+def get_projects(
+    only: type = Project,
+    names: Iterable[str] | None = None,
+) -> tuple[tuple[str, type[Project]], ...]:
     """
-    Get all scrap projects, optionally filtered by superclass.
+    Get all scrap projects, optionally filtered by superclass or names; project
+    classes are loaded only when requested.
     """
-    return tuple(
-        (entry_point.name, project_class)
-        for entry_point in entry_points(group='scrap.project')
-        if issubclass((project_class := entry_point.load()), only)
-    )
+    return registry.projects(only=only, names=names)
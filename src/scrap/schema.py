@@ -0,0 +1,187 @@
+from array import array
+from collections.abc import Hashable, Mapping
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from .columnar import to_arrow_table
+from .exception import ShapeError
+from .stvector import LazyVector, Step, StVector
+
+if TYPE_CHECKING:
+    import pyarrow as pa  # optional dependency, install scrap[arrow]
+
+
+@dataclass
+class PlanNode:
+    """
+    Node of compiled schema: steps from parent node, fields ending here, and
+    branches continuing from the result.
+    """
+
+    steps: tuple[Step, ...] = ()
+    fields: list[str] = field(default_factory=list)
+    children: dict[Hashable, 'PlanNode'] = field(default_factory=dict)
+
+
+class Schema:
+    """
+    Declarative multi-field extraction.
+
+    Fields are `LazyVector` chains recorded without source, evaluated relative to
+    row elements selected with `rows` chain, or to the whole document. Chains are
+    compiled into a single plan where common prefixes, like shared `css()`
+    containers, are evaluated once for all rows and fields.
+
+    With `first=True`, list values are replaced with their first non-list item, or
+    `None` when there are no items.
+    """
+
+    def __init__(
+        self,
+        fields: Mapping[str, LazyVector[Any]],
+        rows: LazyVector[Any] | None = None,
+        first: bool = False,
+    ) -> None:
+        self.fields = dict(fields)
+        self.rows = rows
+        self.first = first
+        self.plan = compile_plan(self.fields)
+
+    def select_rows(self, vector: StVector[Any]) -> StVector[Any]:
+        """
+        Get vector of row elements with single level.
+        """
+        rows = self.rows.run(vector) if self.rows is not None else vector
+        return as_rows(rows)
+
+    def columns(self, vector: StVector[Any]) -> dict[str, StVector[Any]]:
+        """
+        Evaluate all fields, return vectors with one top level item per row.
+        """
+        return self.row_columns(self.select_rows(vector))
+
+    def run(self, vector: StVector[Any]) -> list[dict[str, Any]]:
+        """
+        Evaluate schema, return one record per row.
+        """
+        return self.row_records(self.select_rows(vector))
+
+    def table(self, vector: StVector[Any]) -> 'pa.Table':
+        """
+        Evaluate schema into Arrow table with one row per row element. Requires
+        optional `pyarrow` dependency.
+        """
+        return to_arrow_table(self.columns(vector))
+
+    def row_columns(self, rows: StVector[Any]) -> dict[str, StVector[Any]]:
+        """
+        Evaluate all fields on already selected rows.
+        """
+        count = len(rows)
+        columns: dict[str, StVector[Any]] = {}
+        evaluate(self.plan, rows, columns)
+        for name, column in columns.items():
+            if column.depth == 0 or column.counts[0] != count:
+                raise ShapeError(f'Field {name!r} is not aligned with rows')
+        return {name: columns[name] for name in self.fields}
+
+    def row_records(self, rows: StVector[Any]) -> list[dict[str, Any]]:
+        """
+        Evaluate schema on already selected rows, return one record per row.
+        """
+        columns = {
+            name: column.to_list() for name, column in self.row_columns(rows).items()
+        }
+        if self.first:
+            columns = {
+                name: [first_item(v) for v in values]
+                for name, values in columns.items()
+            }
+        names = list(columns)
+        return [
+            dict(zip(names, row, strict=True))
+            for row in zip(*columns.values(), strict=True)
+        ]
+
+
+# helpers
+
+
+def compile_plan(fields: Mapping[str, LazyVector[Any]]) -> PlanNode:
+    """
+    Merge field chains into trie of steps, then join unbranched runs of steps, so
+    that consecutive elementwise steps are fused on evaluation.
+    """
+    root = PlanNode()
+    for name, chain in fields.items():
+        if chain.source is not None:
+            raise ValueError(f'Field {name!r} chain must be recorded without source')
+        node = root
+        for step in chain.steps:
+            node = node.children.setdefault(step_key(step), PlanNode(steps=(step,)))
+        node.fields.append(name)
+    compress_plan(root)
+    return root
+
+
+def compress_plan(node: PlanNode) -> None:
+    for key, child in list(node.children.items()):
+        while len(child.children) == 1 and not child.fields:
+            (grandchild,) = child.children.values()
+            child = PlanNode(
+                steps=child.steps + grandchild.steps,
+                fields=grandchild.fields,
+                children=grandchild.children,
+            )
+        node.children[key] = child
+        compress_plan(child)
+
+
+def evaluate(
+    node: PlanNode,
+    vector: StVector[Any],
+    columns: dict[str, StVector[Any]],
+) -> None:
+    if node.steps:
+        vector = LazyVector(steps=node.steps).run(vector)
+    for name in node.fields:
+        columns[name] = vector
+    for child in node.children.values():
+        evaluate(child, vector, columns)
+
+
+def as_rows(vector: StVector[Any]) -> StVector[Any]:
+    """
+    Get vector with single level of rows; scalar document is a single row.
+    """
+    if vector.depth == 0:
+        return vector.from_buffers(vector.values, (array('q', [0, 1]),))
+    elif vector.depth > 1:
+        return vector.flatten()
+    return vector
+
+
+def step_key(step: Step) -> Hashable:
+    return (step.name, step.func, freeze(step.args), freeze(step.kwargs))
+
+
+def freeze(value: object) -> Hashable:
+    if isinstance(value, Mapping):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    elif isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    elif isinstance(value, Hashable):
+        return value
+    return id(value)
+
+
+def first_item(value: object) -> object:
+    """
+    Get first non-list item of nested list in depth-first order.
+    """
+    if not isinstance(value, list):
+        return value
+    for item in value:
+        if (ret := first_item(item)) is not None:
+            return ret
+    return None
@@ -0,0 +1,93 @@
+import hashlib
+from collections.abc import AsyncIterator, Hashable
+from dataclasses import dataclass
+from typing import Any
+
+from yarl import URL
+
+from .incremental import subtree_hash
+from .page import PageProtocol
+from .schema import Schema, first_item
+from .stvector import HtmlVector, LazyVector
+
+
+@dataclass(slots=True)
+class ScrollStats:
+    rounds: int = 0
+    parsed: int = 0  # rounds with changed content
+    rows: int = 0  # new rows extracted
+
+
+class ScrollHarvester:
+    """
+    Incremental row extraction from infinite scroll pages.
+
+    Every round, page content is stream-parsed, and only rows matching `rows` css
+    selector are built and kept, one at a time. Rows are identified by the first
+    value of `key` chain, or by subtree hash when there is no key or value is
+    `None`; `schema` fields are evaluated on new rows only, and records are yielded
+    as soon as extracted. Then page is scrolled down `scroll` pages, and after
+    `delay` milliseconds the next round starts. Harvesting stops after `patience`
+    rounds without new rows, or after `max_rounds`.
+    """
+
+    def __init__(
+        self,
+        rows: str,
+        schema: Schema,
+        key: LazyVector[Any] | None = None,
+        *,
+        scroll: int = 1,
+        delay: int | float = 500,
+        patience: int = 2,
+        max_rounds: int | None = None,
+    ) -> None:
+        if schema.rows is not None:
+            raise ValueError('Schema fields must be relative to rows selected by css')
+        self.rows = rows
+        self.schema = schema
+        self.key = key
+        self.scroll = scroll
+        self.delay = delay
+        self.patience = patience
+        self.max_rounds = max_rounds
+        self.stats = ScrollStats()
+        self.seen: set[Hashable] = set()
+
+    async def harvest(self, page: PageProtocol) -> AsyncIterator[dict[str, Any]]:
+        """
+        Scroll page and yield records of rows not seen before.
+        """
+        base_url = URL(await page.get_url()).with_path('')
+        digest = b''
+        idle = 0
+        while self.max_rounds is None or self.stats.rounds < self.max_rounds:
+            if self.stats.rounds:
+                await page.scroll_page_down(self.scroll)
+                await page.sleep(self.delay)
+            self.stats.rounds += 1
+            content = (await page.get_content()).encode()
+            new = 0
+            prev, digest = digest, hashlib.blake2b(content).digest()
+            if digest != prev:  # unchanged content is not parsed again
+                self.stats.parsed += 1
+                rows = HtmlVector.from_stream(
+                    (content,), css=self.rows, base_url=base_url, encoding='utf-8'
+                )
+                for row in rows:
+                    if (key := self.row_key(row)) in self.seen:
+                        continue
+                    self.seen.add(key)
+                    new += 1
+                    self.stats.rows += 1
+                    yield self.schema.run(row)[0]
+            idle = 0 if new else idle + 1
+            if idle >= self.patience:
+                break
+
+    def row_key(self, row: HtmlVector[Any]) -> Hashable:
+        if self.key is not None:
+            value = first_item(self.key.run(row).to_list())
+            if value is not None:
+                return value
+        return subtree_hash(row.scalar())
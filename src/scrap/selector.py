@@ -0,0 +1,106 @@
+from collections.abc import Callable, Mapping
+
+from cssselect import HTMLTranslator
+from cssselect.xpath import XPathExpr
+from lxml.cssselect import CSSSelector
+from lxml.etree import XPath
+
+from .cache import LRUCache
+
+type Namespaces = tuple[tuple[str, str], ...]
+
+DEFAULT_MAXSIZE = 1024
+
+
+class SelfMatchTranslator(HTMLTranslator):
+    """
+    CSS translator building XPath that tests context element itself: combinators
+    become conditions on ancestors. Sibling combinators raise `ValueError`, because
+    preceding siblings are cleared when parsing html stream.
+    """
+
+    def xpath_descendant_combinator(
+        self, left: XPathExpr, right: XPathExpr
+    ) -> XPathExpr:
+        return right.add_condition(f'ancestor::{left}')
+
+    def xpath_child_combinator(self, left: XPathExpr, right: XPathExpr) -> XPathExpr:
+        return right.add_condition(f'parent::{left}')
+
+    def xpath_direct_adjacent_combinator(
+        self, left: XPathExpr, right: XPathExpr
+    ) -> XPathExpr:
+        raise ValueError('Sibling combinator "+" is not supported when streaming')
+
+    def xpath_indirect_adjacent_combinator(
+        self, left: XPathExpr, right: XPathExpr
+    ) -> XPathExpr:
+        raise ValueError('Sibling combinator "~" is not supported when streaming')
+
+
+class SelectorCache(LRUCache[tuple[str, str, Namespaces], XPath]):
+    """
+    Bounded LRU cache of compiled XPath and CSS selectors.
+    """
+
+    def __init__(self, maxsize: int | None = DEFAULT_MAXSIZE) -> None:
+        super().__init__(maxsize)
+
+    def css(self, expr: str, namespaces: Mapping[str, str] | None = None) -> XPath:
+        """
+        Get compiled CSS selector, translated with lxml.html rules.
+        """
+        return self._get('css', expr, namespaces, compile_css)
+
+    def css_match(
+        self,
+        expr: str,
+        namespaces: Mapping[str, str] | None = None,
+    ) -> XPath:
+        """
+        Get compiled CSS selector that tests element itself instead of descendants.
+        """
+        return self._get('css_match', expr, namespaces, compile_css_match)
+
+    def xpath(self, expr: str, namespaces: Mapping[str, str] | None = None) -> XPath:
+        """
+        Get compiled XPath expression.
+        """
+        return self._get('xpath', expr, namespaces, compile_xpath)
+
+    def _get(
+        self,
+        kind: str,
+        expr: str,
+        namespaces: Mapping[str, str] | None,
+        compiler: Callable[[str, Namespaces], XPath],
+    ) -> XPath:
+        key = (kind, expr, namespaces_key(namespaces))
+        if (selector := self.get(key)) is None:
+            # syntax errors are raised to the caller and not cached
+            selector = compiler(expr, key[2])
+            self.put(key, selector)
+        return selector
+
+
+# helpers
+
+
+def namespaces_key(namespaces: Mapping[str, str] | None) -> Namespaces:
+    return tuple(sorted(namespaces.items())) if namespaces else ()
+
+
+def compile_css(expr: str, namespaces: Namespaces = ()) -> XPath:
+    return CSSSelector(expr, namespaces=dict(namespaces) or None, translator='html')
+
+
+def compile_css_match(expr: str, namespaces: Namespaces = ()) -> XPath:
+    path = SelfMatchTranslator().css_to_xpath(expr, prefix='self::')
+    return XPath(path, namespaces=dict(namespaces) or None)
+
+
+def compile_xpath(expr: str, namespaces: Namespaces = ()) -> XPath:
+    return XPath(expr, namespaces=dict(namespaces) or None)
+
+
+selector_cache = SelectorCache()
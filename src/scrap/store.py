@@ -0,0 +1,384 @@
+import copy
+import fcntl
+import heapq
+import mmap
+import os
+import pickle
+import struct
+from bisect import bisect_right
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from types import TracebackType
+from typing import Self
+from uuid import UUID
+
+from uuid6 import uuid7
+
+from .item import (
+    BaseDataItem,
+    BaseHtmlItem,
+    CompactHtmlItem,
+    compress_text,
+    decompress_text,
+    hash_content,
+)
+
+PROTOCOL = pickle.HIGHEST_PROTOCOL
+SEGMENT_MAGIC = b'SCRS'
+INDEX_MAGIC = b'SCRI'
+VERSION = 1
+
+SEGMENT_HEADER = struct.Struct('<4sI')  # magic, version
+RECORD_HEADER = struct.Struct('<I16s')  # payload length, iid
+INDEX_HEADER = struct.Struct('<4sIQ16s16s')  # magic, version, count, min iid, max iid
+INDEX_ENTRY = struct.Struct('<16sQ')  # iid, record offset
+CONTENT_HEADER = struct.Struct('<16sI')  # content hash, compressed body length
+
+
+@dataclass(frozen=True)
+class Segment:
+    """
+    Immutable segment file with records sorted by item iid, and its sparse index.
+    """
+
+    path: Path
+    count: int
+    min_iid: int
+    max_iid: int
+    index_iids: list[int]
+    index_offsets: list[int]
+
+    @classmethod
+    def load(cls, path: Path) -> Self:
+        data = path.with_suffix('.idx').read_bytes()
+        magic, version, count, min_iid, max_iid = INDEX_HEADER.unpack_from(data)
+        if magic != INDEX_MAGIC or version != VERSION:
+            raise ValueError(f'Unsupported index file {path}')
+        entries = list(INDEX_ENTRY.iter_unpack(data[INDEX_HEADER.size :]))
+        return cls(
+            path=path,
+            count=count,
+            min_iid=int.from_bytes(min_iid),
+            max_iid=int.from_bytes(max_iid),
+            index_iids=[int.from_bytes(iid) for iid, _ in entries],
+            index_offsets=[offset for _, offset in entries],
+        )
+
+    def seek(self, iid: int) -> int:
+        """
+        Get offset of the last indexed record with iid not greater than given one.
+        """
+        pos = bisect_right(self.index_iids, iid) - 1
+        return self.index_offsets[max(pos, 0)]
+
+
+class ContentStore:
+    """
+    Append-only file of distinct html bodies, compressed and addressed by content
+    hash. Index of body offsets is kept in memory and rebuilt on open from record
+    headers. Appends and index updates hold file lock, so the file can be shared
+    by several processes.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = Path(path)
+        self._file = open(self.path, 'ab+', buffering=0)
+        self._index: dict[str, tuple[int, int]] = {}
+        self._size = 0
+        self.refresh()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._index
+
+    def refresh(self) -> None:
+        """
+        Index bodies appended since last refresh, e.g. by another process.
+        """
+        fd = self._file.fileno()
+        fcntl.flock(fd, fcntl.LOCK_SH)  # skip records being written
+        try:
+            self._refresh()
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def _refresh(self) -> None:
+        fd = self._file.fileno()
+        end = os.fstat(fd).st_size
+        while self._size < end:
+            raw_key, length = CONTENT_HEADER.unpack(
+                os.pread(fd, CONTENT_HEADER.size, self._size)
+            )
+            offset = self._size + CONTENT_HEADER.size
+            self._index[raw_key.hex()] = (offset, length)
+            self._size = offset + length
+
+    def put(self, text: str) -> str:
+        """
+        Store html body unless already stored, return its content hash.
+        """
+        key = hash_content(text)
+        if key not in self._index:
+            self.put_data(key, compress_text(text))
+        return key
+
+    def put_data(self, key: str, data: bytes) -> None:
+        """
+        Store body already compressed with `compress_text()` under given hash.
+        """
+        if key in self._index:
+            return
+        fd = self._file.fileno()
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            self._refresh()
+            if key in self._index:  # written by another process
+                return
+            self._file.write(CONTENT_HEADER.pack(bytes.fromhex(key), len(data)) + data)
+            self._size = self._file.tell()  # end of file in append mode
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        self._index[key] = (self._size - len(data), len(data))
+
+    def get(self, key: str) -> str:
+        return decompress_text(self.get_data(key))
+
+    def get_data(self, key: str) -> bytes:
+        if key not in self._index:
+            self.refresh()  # may be written by another process
+        offset, length = self._index[key]
+        return os.pread(self._file.fileno(), length, offset)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ItemStore[I: BaseDataItem]:
+    """
+    Append-only on-disk store of data items.
+
+    Items are buffered and written in batches; every batch becomes a segment file
+    with records sorted by time-ordered `iid`, and a sparse index of every
+    `index_interval`-th record. Reads are memory-mapped: point lookups and time
+    range scans only touch the part of the segment located with the index. Store
+    files are unpickled on read and must come from a trusted source.
+
+    With `dedup=True`, html bodies of html items are stored once per distinct
+    `content_hash` in `ContentStore`, and item records only reference them.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        batch_size: int = 1000,
+        index_interval: int = 64,
+        dedup: bool = False,
+    ) -> None:
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.index_interval = index_interval
+        self.content = ContentStore(self.path / 'content.dat') if dedup else None
+        self._buffer: list[I] = []
+        self._segments: list[Segment] = []
+        self._maps: dict[Path, mmap.mmap] = {}
+        self.refresh()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return sum(s.count for s in self._segments) + len(self._buffer)
+
+    def __iter__(self) -> Iterator[I]:
+        return self.scan()
+
+    @property
+    def segments(self) -> tuple[Segment, ...]:
+        return tuple(self._segments)
+
+    def refresh(self) -> None:
+        """
+        Reload list of segments, e.g. written by another process.
+        """
+        known = {s.path for s in self._segments}
+        for path in sorted(self.path.glob('*.seg')):
+            if path not in known:
+                self._segments.append(Segment.load(path))
+
+    # write
+
+    def append(self, item: I) -> None:
+        self._buffer.append(item)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def extend(self, items: Iterable[I]) -> None:
+        for item in items:
+            self.append(item)
+
+    def flush(self) -> None:
+        """
+        Write buffered items to new segment.
+        """
+        if not self._buffer:
+            return
+        items = sorted(self._buffer, key=lambda item: item.iid.int)
+        # segment names are time-ordered too, so segments are loaded in write order
+        seg_path = self.path / f'{uuid7().hex}.seg'
+        idx_path = seg_path.with_suffix('.idx')
+        tmp_seg = seg_path.with_suffix('.seg.tmp')
+        tmp_idx = seg_path.with_suffix('.idx.tmp')
+        index = bytearray(
+            INDEX_HEADER.pack(
+                INDEX_MAGIC,
+                VERSION,
+                len(items),
+                items[0].iid.bytes,
+                items[-1].iid.bytes,
+            )
+        )
+        with open(tmp_seg, 'wb') as f:
+            f.write(SEGMENT_HEADER.pack(SEGMENT_MAGIC, VERSION))
+            for i, item in enumerate(items):
+                if i % self.index_interval == 0:
+                    index += INDEX_ENTRY.pack(item.iid.bytes, f.tell())
+                payload = pickle.dumps(self._pack(item), protocol=PROTOCOL)
+                f.write(RECORD_HEADER.pack(len(payload), item.iid.bytes))
+                f.write(payload)
+        tmp_idx.write_bytes(index)
+        # segment becomes visible only when its index is in place
+        os.replace(tmp_idx, idx_path)
+        os.replace(tmp_seg, seg_path)
+        self._segments.append(Segment.load(seg_path))
+        self._buffer.clear()
+
+    def close(self) -> None:
+        self.flush()
+        for mm in self._maps.values():
+            mm.close()
+        self._maps.clear()
+        if self.content is not None:
+            self.content.close()
+
+    def _pack(self, item: I) -> I:
+        """
+        Move html body of item to content store, return item stub to be pickled.
+        """
+        if self.content is None or not isinstance(item, BaseHtmlItem):
+            return item
+        stub = copy.copy(item)
+        if isinstance(item, CompactHtmlItem):
+            self.content.put_data(item.content_hash, item.html_data)
+            object.__setattr__(stub, 'html_data', b'')
+        else:
+            if item.content_hash not in self.content:
+                self.content.put_data(item.content_hash, compress_text(item.html))
+            object.__setattr__(stub, 'html', '')
+        return stub
+
+    def _unpack(self, item: I) -> I:
+        if self.content is None or not isinstance(item, BaseHtmlItem):
+            return item
+        data = self.content.get_data(item.content_hash)
+        if isinstance(item, CompactHtmlItem):
+            object.__setattr__(item, 'html_data', data)
+        else:
+            object.__setattr__(item, 'html', decompress_text(data))
+        return item
+
+    # read
+
+    def get(self, iid: UUID) -> I | None:
+        """
+        Get item by iid.
+        """
+        for item in self._buffer:
+            if item.iid == iid:
+                return item
+        key = iid.int
+        for segment in self._segments:
+            if segment.min_iid <= key <= segment.max_iid:
+                for rec_iid, item in self._iter_segment(segment, key, key):
+                    if rec_iid == key:
+                        return item
+        return None
+
+    def scan(
+        self,
+        start: datetime | UUID | None = None,
+        end: datetime | UUID | None = None,
+    ) -> Iterator[I]:
+        """
+        Iterate over stored items in iid order, optionally limited to time range
+        `start <= created < end`, given as datetime or uuid7 bounds.
+        """
+        lo = 0 if start is None else uuid7_bound(start)
+        hi = (1 << 128) if end is None else uuid7_bound(end)
+        streams = [
+            self._iter_segment(segment, lo, hi - 1)
+            for segment in self._segments
+            if segment.min_iid < hi and segment.max_iid >= lo
+        ]
+        buffered = sorted(
+            (item.iid.int, item) for item in self._buffer if lo <= item.iid.int < hi
+        )
+        streams.append(iter(buffered))
+        for _, item in heapq.merge(*streams, key=lambda rec: rec[0]):
+            yield item
+
+    def _iter_segment(
+        self, segment: Segment, lo: int, hi: int
+    ) -> Iterator[tuple[int, I]]:
+        """
+        Iterate over records of segment with `lo <= iid <= hi`.
+        """
+        mm = self._map(segment.path)
+        pos = segment.seek(lo)
+        end = len(mm)
+        view = memoryview(mm)
+        try:
+            while pos < end:
+                length, raw_iid = RECORD_HEADER.unpack_from(mm, pos)
+                iid = int.from_bytes(raw_iid)
+                pos += RECORD_HEADER.size
+                if iid > hi:
+                    break
+                if iid >= lo:
+                    # store files are written by this class and trusted
+                    item = pickle.loads(view[pos : pos + length])  # noqa: S301
+                    yield iid, self._unpack(item)
+                pos += length
+        finally:
+            view.release()
+
+    def _map(self, path: Path) -> mmap.mmap:
+        if (mm := self._maps.get(path)) is None:
+            with open(path, 'rb') as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[path] = mm
+        return mm
+
+
+# helpers
+
+
+def uuid7_bound(value: datetime | UUID) -> int:
+    """
+    Get lowest uuid7 integer value for timestamp; uuids are returned as is.
+    """
+    if isinstance(value, UUID):
+        return value.int
+    return int(value.timestamp() * 1000) << 80
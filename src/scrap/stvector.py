@@ -1,92 +1,259 @@
+import operator
+import os
 import re
+import sys
+from array import array
 from collections.abc import Iterable, Iterator
-from datetime import date, datetime
-from typing import TYPE_CHECKING, ParamSpec, TypeVar
+from datetime import date, datetime, tzinfo
+from functools import partial
+from itertools import accumulate, compress, pairwise
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    BinaryIO,
+    ClassVar,
+    NamedTuple,
+    ParamSpec,
+    SupportsIndex,
+    TypeVar,
+    cast,
+)
 from zoneinfo import ZoneInfo
 
 from lxml.etree import ElementBase as ElementBase
-from lxml.etree import tostring
+from lxml.etree import HTMLPullParser, tostring
 from lxml.html import HtmlElement as HtmlElement
-from lxml.html import fromstring
+from lxml.html import HtmlElementClassLookup, fromstring
 from typing_extensions import Self
 
+from .columnar import to_arrow, to_columnar, to_masked_array
 from .exception import ShapeError
+from .memory import MemoryUsage, detach_values, memory_usage
+from .selector import SelectorCache, selector_cache
+from .trace import call_traced, traced
 
 if TYPE_CHECKING:
     import builtins  # noqa: F401  # used in type hint
-    from collections.abc import Callable, Sequence  # noqa: F401  # used in type hint
+    from collections.abc import (  # noqa: F401  # used in type hint
+        Callable,
+        Collection,
+        Mapping,
+        Sequence,
+    )
     from typing import Concatenate  # noqa: F401  # used in type hint
 
+    import numpy as np  # noqa: F401  # used in type hint
+    import pyarrow as pa  # noqa: F401  # used in type hint
     import yarl  # noqa: F401  # used in type hint
 
+    from .columnar import Columnar, DTypeLike  # noqa: F401  # used in type hint
+
 P = ParamSpec('P')
 R = TypeVar('R', bound=object)
 T = TypeVar('T', bound=object)
 
 type Nested[T] = T | list[T] | list[Nested[T]]
+type Offsets = tuple[array[int], ...]
+type Shape = tuple[int | None, ...]
+
+CHUNK_SIZE = 64 * 1024
 
 
 class StVector[T]:
     """
     Data structure providing easy chaining interface to html parsing results.
+
+    Data is stored in flat ragged layout, similar to Arrow list arrays: a single
+    buffer of bottom level values and one offsets array per level. Nested list
+    representation is available as `data` property.
     """
 
     def __init__(self, data: Nested[T], depth: int = 0) -> None:
-        self.data: Nested[T] = data
-        self.depth: int = depth
+        values, offsets = from_nested(data, depth)
+        self._values: list[T] = values  # type: ignore[assignment]
+        self._index: array[int] | None = None
+        self._offsets: Offsets = offsets
+        self._shape: Shape | None = None
+
+    @classmethod
+    def from_buffers(cls, values: list[T], offsets: Offsets = ()) -> Self:
+        """
+        Create vector from bottom level values and offsets arrays, without copying.
+        """
+        ret = cls.__new__(cls)
+        ret._values = values
+        ret._index = None
+        ret._offsets = offsets
+        ret._shape = None
+        return ret
+
+    def _view(self, index: array[int], offsets: Offsets) -> Self:
+        """
+        Create vector of values at `index` positions, sharing values buffer.
+        """
+        ret = self.from_buffers(self._values, offsets)
+        if self._index is None:
+            ret._index = index
+        else:
+            ret._index = array('q', (self._index[i] for i in index))
+        return ret
+
+    @property
+    def data(self) -> Nested[T]:
+        """
+        Nested list representation, built from buffers on every access.
+        """
+        return self.to_list()
+
+    @data.setter
+    def data(self, data: Nested[T]) -> None:
+        values, offsets = from_nested(data, self.depth)
+        self._set_buffers(values, offsets)  # type: ignore[arg-type]
+
+    @property
+    def depth(self) -> int:
+        return len(self._offsets)
+
+    @depth.setter
+    def depth(self, depth: int) -> None:
+        ret = self.level(depth)
+        self._set_buffers(ret.values, ret.offsets)
+
+    def _set_buffers(self, values: list[T], offsets: Offsets) -> None:
+        self._values = values
+        self._index = None
+        self._offsets = offsets
+        self._shape = None
+
+    @property
+    def values(self) -> list[T]:
+        """
+        Bottom level values; values of view are collected from shared buffer on
+        first access.
+        """
+        if self._index is not None:
+            self._values = [self._values[i] for i in self._index]
+            self._index = None
+        return self._values
+
+    @property
+    def is_view(self) -> bool:
+        return self._index is not None
+
+    @property
+    def offsets(self) -> Offsets:
+        return self._offsets
+
+    @property
+    def counts(self):  # type: () -> tuple[builtins.int, ...]
+        """
+        Total number of items at each level, from top to bottom.
+        """
+        return tuple(level_offsets[-1] for level_offsets in self._offsets)
+
+    @property
+    def shape(self) -> Shape:
+        """
+        Size of groups at each level, from top to bottom, or `None` for levels
+        where groups have different sizes. Computed once per vector.
+        """
+        if self._shape is None:
+            self._shape = get_shape(self._offsets)
+        return self._shape
+
+    @property
+    def is_ragged(self) -> bool:
+        return None in self.shape
 
     @property
     def is_empty(self) -> bool:
-        return self.data == []
+        if self.depth == 0:
+            return self.values[0] == []
+        return self._offsets[0][-1] == 0
 
     @property
     def is_scalar(self) -> bool:
         return self.depth == 0
 
     def copy(self) -> Self:
-        return self.__class__(copy_upto_level(self.data, self.depth), depth=self.depth)
+        return self.from_buffers(self.values.copy(), self._offsets)
+
+    @traced
+    def detach(self, func=None):  # type: (Callable[[HtmlElement], object] | None) -> StVector[Any]
+        """
+        Convert element leaves to outer html, or with `func`, and lxml smart strings
+        to plain strings, so that result doesn't keep parsed documents alive.
+        """
+        values = detach_values(self.values, func)
+        return self.from_buffers(values, self._offsets)  # type: ignore[arg-type]
+
+    def memory_usage(self) -> MemoryUsage:
+        """
+        Estimate memory held by vector and documents referenced by its leaves.
+        """
+        return memory_usage(self._values, self._offsets, self._index)
+
+    def to_list(self) -> Nested[T]:
+        """
+        Convert to nested list representation.
+        """
+        return to_nested(self.values, self._offsets)
 
     def __iter__(self) -> Iterator[Self]:
         if self.depth == 0:
             raise ValueError('Unable to iterate scalar')
-        for item in iter_at_level(self.data, self.depth):
-            yield self.__class__(item, depth=self.depth - 1)
+        for item in self.values:
+            yield self.from_buffers([item])
 
     def __bool__(self) -> bool:
-        for _ in iter_at_level(self.data, self.depth):
-            return True
-        return False
+        return len(self) > 0
 
     def __len__(self) -> int:
-        return sum(1 for _ in iter_at_level(self.data, self.depth))
+        return len(self._values if self._index is None else self._index)
 
-    def __getitem__(self, index: int) -> Self:
+    @traced
+    def __getitem__(self, index):  # type: (SupportsIndex | slice | Sequence[builtins.int] | Sequence[bool] | np.ndarray[Any, Any] | StVector[Any]) -> Self
+        """
+        Select bottom level items of each group. Integer index selects single item
+        and removes bottom level; slice or sequence of positions keep the level.
+        Boolean mask of the same shape, like result of `any_()`, keeps items where
+        mask is true. Result is a view sharing values buffer with this vector.
+        """
         if self.depth == 0:
             raise ValueError('Unable to access items of scalar')
-        elif self.depth == 1:
-            return self.__class__(self.data[index], depth=0)  # type: ignore[index]  # depth==1 means data is a list
+        offsets = self._offsets[-1]
+        if (position := int_index(index)) is not None:
+            positions = array('q')
+            for start, stop in pairwise(offsets):
+                pos = (start if position >= 0 else stop) + position
+                if not start <= pos < stop:
+                    raise IndexError('list index out of range')
+                positions.append(pos)
+            return self._view(positions, self._offsets[:-1])
+        items = cast('slice | Collection[Any] | StVector[Any]', index)
+        if isinstance(items, StVector):
+            if items.offsets != self._offsets:
+                raise ShapeError('Mask shape does not match vector shape')
+            positions, level_offsets = mask_positions(offsets, items.values)
+        elif isinstance(items, slice):
+            positions, level_offsets = select_positions(offsets, items)
+        elif is_mask(items):
+            if len(items) != len(self):
+                raise ShapeError('Mask length does not match number of items')
+            positions, level_offsets = mask_positions(offsets, items)
         else:
-            ret = self.copy()
-            for parent in iter_at_level(ret.data, ret.depth - 2):
-                if not isinstance(parent, list):
-                    raise iterable_required(parent)
-                parent[:] = (item[index] for item in parent.copy())  # type: ignore[index,misc]  # depth>=2 means item is a list
-            ret.depth -= 1
-            return ret
+            positions, level_offsets = select_positions(offsets, items)
+        return self._view(positions, self._offsets[:-1] + (level_offsets,))
 
+    @traced
     def apply(self, func, *args, **kwargs):  # type: (Callable[Concatenate[Nested[T], P], Nested[R]], P.args, P.kwargs) -> StVector[R]
         """
         Apply arbitrary function to all items on bottom level.
         """
-        if self.depth == 0:
-            return self.__class__(func(self.data, *args, **kwargs))  # type: ignore[arg-type,return-value]
-        ret = self.copy()
-        for parent in iter_at_level(ret.data, ret.depth - 1):
-            if not isinstance(parent, list):
-                raise iterable_required(parent)
-            parent[:] = (func(item, *args, **kwargs) for item in parent.copy())  # type: ignore[misc]
-        return ret  # type: ignore[return-value]
+        values = [func(item, *args, **kwargs) for item in self.values]
+        return self.from_buffers(values, self._offsets)  # type: ignore[arg-type,return-value]
 
+    @traced
     def flatten(self, level=1):  # type: (int) -> StVector[T]
         """
         Flatten all items below specified level; by default, flatten up to top level.
@@ -96,14 +263,16 @@ class StVector[T]:
             raise ValueError('Unable to flatten scalar')
         if depth == 0:
             raise ValueError('Unable to flatten to scalar')
-        ret = self.copy()
-        for parent in iter_at_level(ret.data, depth - 1):
-            if not isinstance(parent, list):
-                raise iterable_required(parent)
-            parent[:] = iter_at_level(parent.copy(), ret.depth - depth + 1)  # type: ignore[assignment,misc]
-        ret.depth = depth
+        if depth > self.depth:
+            raise ValueError('Data has not enough levels to be flattened')
+        offsets = self._offsets[: depth - 1] + (
+            compose_offsets(self._offsets[depth - 1 :]),
+        )
+        ret = self.from_buffers(self._values, offsets)
+        ret._index = self._index
         return ret
 
+    @traced
     def level(self, index: int | None = None, /, up: int = 0, down: int = 0) -> Self:
         """
         Change data level.
@@ -115,81 +284,71 @@ class StVector[T]:
         new_depth += down - up
         if new_depth < 0:
             raise ValueError('Unable to set negative depth')
-        ret = self.__class__(self.data)
-        ret.depth = new_depth
-        return ret
+        values, offsets = self.values, self._offsets
+        while len(offsets) < new_depth:
+            values, offsets = explode_values(values, offsets)
+        while len(offsets) > new_depth:
+            values, offsets = collapse_values(values, offsets)
+        return self.from_buffers(values, offsets)
 
     def scalar(self, nested: bool = True) -> T:
         """
         Return single scalar data value and raise exception otherwise.
         """
-        return get_nested_scalar(self.data, recurse=nested)
+        if self.depth == 0:
+            return get_nested_scalar(self.values[0], recurse=nested)
+        elif not nested:
+            raise ShapeError(
+                'Not a scalar' if self._offsets[0][-1] == 1 else 'Not a nested scalar'
+            )
+        elif self.counts != (1,) * self.depth:
+            raise ShapeError('Not a nested scalar')
+        return get_nested_scalar(self.values[0])
 
     # transformations
 
+    @traced
     def all_(self):  # type: () -> StVector[bool]
         ret = self.level(up=1).apply(
             lambda x: all(x) if isinstance(x, Iterable) else bool(x)
         )
         return ret
 
+    @traced
     def any_(self):  # type: () -> StVector[bool]
         ret = self.level(up=1).apply(
             lambda x: any(x) if isinstance(x, Iterable) else bool(x)
         )
         return ret
 
-    def date(self, fmt):  # type: (str) -> StVector[date | None]
-        def _date(item: str) -> date | None:
-            if not isinstance(item, str):
-                raise TypeError(f'Required str instead of {type(item)}')
-            try:
-                return datetime.strptime(item.strip(), fmt).date()
-            except ValueError:
-                return None
-
-        ret = self.apply(_date)  # type: ignore[arg-type]
+    @traced
+    def date(self, fmt=None):  # type: (str | None) -> StVector[date | None]
+        """
+        Parse dates with `strptime` format; ISO 8601 format is used by default.
+        """
+        ret = self.apply(_date, fmt)  # type: ignore[arg-type]
         return ret
 
-    def datetime(self, fmt, tz=None):  # type: (str, str | ZoneInfo | None) -> StVector[datetime | None]
-        def _datetime(item: str) -> datetime | None:
-            if not isinstance(item, str):
-                raise TypeError(f'Required str instead of {type(item)}')
-            try:
-                dt = datetime.strptime(item.strip(), fmt)
-                if dt.tzinfo is None and tz is not None:
-                    dt = dt.replace(tzinfo=ZoneInfo(tz) if isinstance(tz, str) else tz)
-                return dt
-            except ValueError:
-                return None
-
-        ret = self.apply(_datetime)  # type: ignore[arg-type]
+    @traced
+    def datetime(self, fmt=None, tz=None):  # type: (str | None, str | tzinfo | None) -> StVector[datetime | None]
+        """
+        Parse datetimes with `strptime` format; ISO 8601 format is used by default.
+        Timezone `tz` is set for naive datetimes.
+        """
+        ret = self.apply(_datetime, fmt, get_tzinfo(tz))  # type: ignore[arg-type]
         return ret
 
+    @traced
     def float(self):  # type: () -> StVector[float | None]
-        def _float(item: str) -> float | None:
-            if not isinstance(item, str):
-                raise TypeError(f'Required str instead of {type(item)}')
-            try:
-                return float(item.strip())
-            except ValueError:
-                return None
-
-        ret = self.apply(_float)  # type: ignore[arg-type]
-        return ret
+        values = convert_batch(self.values, float, _float)  # type: ignore[arg-type]
+        return self.from_buffers(values, self._offsets)  # type: ignore[arg-type,return-value]
 
+    @traced
     def int(self):  # type: () -> StVector[int | None]
-        def _int(item: str) -> int | None:
-            if not isinstance(item, str):
-                raise TypeError(f'Required str instead of {type(item)}')
-            try:
-                return int(item.strip())
-            except BaseException:
-                return None
-
-        ret = self.apply(_int)  # type: ignore[arg-type]
-        return ret
+        values = convert_batch(self.values, int, _int)  # type: ignore[arg-type]
+        return self.from_buffers(values, self._offsets)  # type: ignore[arg-type,return-value]
 
+    @traced
     def join(self, sep=' '):  # type: (str | Sequence[str]) -> StVector[str]
         def _join(item: list[str], sep: str) -> str:
             if not isinstance(item, list):
@@ -206,24 +365,56 @@ class StVector[T]:
             ret = ret.level(up=1).apply(_join, s)  # type: ignore[arg-type]
         return ret  # type: ignore[return-value]
 
+    @traced
     def normspace(self):  # type: () -> StVector[str]
-        def _normspace(item: str) -> str:
-            if not isinstance(item, str):
-                raise TypeError(f'Required str instead of {type(item)}')
-            return re.sub(r'\s+', ' ', item).strip()
-
         ret = self.apply(_normspace)  # type: ignore[arg-type]
         return ret
 
-    def replace(self, old, new, count=-1):  # type: (str, str, builtins.int) -> StVector[str]
-        def _replace(item: str) -> str:
-            if not isinstance(item, str):
-                raise TypeError(f'Required str instead of {type(item)}')
-            return item.replace(old, new, count)
+    @traced
+    def regex_extract(self, pattern, group=None, flags=0):  # type: (str | re.Pattern[str], builtins.int | str | None, builtins.int) -> StVector[str | None]
+        """
+        Extract first match of pattern, or `None`; by default, the first group is
+        extracted when pattern has groups, and the whole match otherwise.
+        """
+        regex = re.compile(pattern, flags)
+        group = default_group(regex) if group is None else group
+        ret = self.apply(_regex_extract, regex, group)  # type: ignore[arg-type]
+        return ret
+
+    @traced
+    def regex_findall(self, pattern, flags=0):  # type: (str | re.Pattern[str], builtins.int) -> StVector[Any]
+        """
+        Find all matches of pattern and add them as new bottom level, like `split`;
+        matches are strings, or tuples when pattern has several groups.
+        """
+        regex = re.compile(pattern, flags)
+        ret = self.apply(_regex_findall, regex).level(self.depth + 1)  # type: ignore[arg-type]
+        return ret
 
-        ret = self.apply(_replace)  # type: ignore[arg-type]
+    @traced
+    def regex_match(self, pattern, flags=0):  # type: (str | re.Pattern[str], builtins.int) -> StVector[bool]
+        """
+        Test whether pattern matches at the beginning of each string, like
+        `re.match`.
+        """
+        ret = self.apply(_regex_match, re.compile(pattern, flags))  # type: ignore[arg-type]
         return ret
 
+    @traced
+    def regex_sub(self, pattern, repl, count=0, flags=0):  # type: (str | re.Pattern[str], str | Callable[[re.Match[str]], str], builtins.int, builtins.int) -> StVector[str]
+        """
+        Replace matches of pattern with `repl` string or function, like `re.sub`.
+        """
+        regex = re.compile(pattern, flags)
+        ret = self.apply(_regex_sub, regex, repl, count)  # type: ignore[arg-type]
+        return ret
+
+    @traced
+    def replace(self, old, new, count=-1):  # type: (str, str, builtins.int) -> StVector[str]
+        ret = self.apply(_replace, old, new, count)  # type: ignore[arg-type]
+        return ret
+
+    @traced
     def split(self, sep=' '):  # type: (str | Sequence[str]) -> StVector[str]
         def _split(item: str, sep: str) -> list[str]:
             if not isinstance(item, str):
@@ -236,81 +427,508 @@ class StVector[T]:
             ret = ret.apply(_split, s).level(ret.depth + 1)  # type: ignore[arg-type,assignment]
         return ret  # type: ignore[return-value]
 
+    @traced
     def string(self):  # type: () -> StVector[str]
-        def _str(item: object) -> str:
-            if isinstance(item, ElementBase):
-                return tostring(item).decode()
-            else:
-                return str(item)
-
         ret = self.apply(_str)
         return ret
 
+    @traced
     def strip(self, chars=None):  # type: (str | None) -> StVector[str]
-        def _strip(item: str, chars: str | None) -> str:
-            if not isinstance(item, str):
-                raise TypeError(f'Required str or bytes instead of {type(item)}')
-            return item.strip() if chars is None else item.strip(chars)
-
         ret = self.apply(_strip, chars)  # type: ignore[arg-type]
         return ret
 
+    @traced
     def text(self):  # type: () -> StVector[str]
-        def _text(item: HtmlElement) -> str:
-            if not isinstance(item, HtmlElement):
-                raise TypeError(f'Required HtmlElement instead of {type(item)}')
-            return str(item.text_content())
-
         ret = self.apply(_text)
         return ret
 
+    # export
+
+    @traced
+    def to_numpy(self, dtype=None):  # type: (DTypeLike | None) -> np.ma.MaskedArray[Any, np.dtype[Any]]
+        """
+        Convert bottom level values to typed NumPy masked array, `None` values are
+        masked. Requires optional `numpy` dependency.
+        """
+        return to_masked_array(self.values, dtype)
+
+    def to_columnar(self, dtype=None):  # type: (DTypeLike | None) -> Columnar
+        """
+        Convert to typed NumPy values, validity mask and offsets arrays. Requires
+        optional `numpy` dependency.
+        """
+        return to_columnar(self.values, self._offsets, dtype)
+
+    def to_arrow(self, type=None):  # type: (pa.DataType | None) -> pa.Array
+        """
+        Convert to Arrow array with one item per top level item, and nested lists
+        for lower levels. Requires optional `pyarrow` dependency.
+        """
+        return to_arrow(self.values, self._offsets, type)
+
+    # lazy evaluation
+
+    def lazy(self) -> 'LazyVector[T]':
+        """
+        Start lazy chain of operations on this vector.
+        """
+        return LazyVector(self)
+
 
 class HtmlVector[T](StVector[T]):
     """
     Structured vector on top of lxml.html Element.
     """
 
+    selector_cache: ClassVar[SelectorCache] = selector_cache
+
     @classmethod
     def from_string(cls, content, base_url=None):  # type: (str | bytes, str | yarl.URL | None) -> HtmlVector[HtmlElement]
         base_url = base_url if base_url is None else str(base_url)
         data = fromstring(content, base_url=base_url)  # type: ignore[arg-type]  # until lxml/lxml-stubs#107 is released
         return cls(data)  # type: ignore[arg-type]
 
-    def attr(self, name):  # type: (str) -> HtmlVector[str | None]
-        def _attr(item: HtmlElement) -> str | None:
-            if not isinstance(item, HtmlElement):
-                raise TypeError(f'Required HtmlElement instead of {type(item)}')
-            return item.get(name)  # type: ignore[no-any-return]
+    @classmethod
+    def from_stream(
+        cls,
+        source,
+        tags=(),
+        css=None,
+        base_url=None,
+        chunk_size=CHUNK_SIZE,
+        encoding=None,
+    ):  # type: (str | os.PathLike[str] | BinaryIO | Iterable[bytes], Iterable[str], str | None, str | yarl.URL | None, builtins.int, str | None) -> Iterator[HtmlVector[HtmlElement]]
+        """
+        Parse html incrementally and yield elements with one of `tags` or matching
+        `css` selector as soon as they are complete.
+
+        Processed subtrees are cleared to keep memory bounded, so yielded element is
+        only valid until the next one is requested. Selector can use element itself
+        and its ancestors, but not siblings or descendants; sibling combinators
+        raise `ValueError`.
+
+        Without `encoding`, it is detected from `<meta charset>`, and documents
+        without it are decoded as Latin-1.
+        """
+        tags = frozenset(tags)
+        if not tags and css is None:
+            raise ValueError('Tags or css selector required')
+        match = None if css is None else cls.selector_cache.css_match(css)
+        base_url = base_url if base_url is None else str(base_url)
+        parser = HTMLPullParser(
+            events=('start', 'end'), base_url=base_url, encoding=encoding
+        )
+        parser.set_element_class_lookup(HtmlElementClassLookup())
+        matched: list[HtmlElement] = []  # stack of open matched elements
 
-        ret = self.apply(_attr)
+        def _events(chunk: bytes | None) -> Iterator[HtmlVector[HtmlElement]]:
+            if chunk is None:
+                parser.close()
+            else:
+                parser.feed(chunk)
+            for event, elem in parser.read_events():
+                if not isinstance(elem, HtmlElement):
+                    continue
+                elif event == 'start':
+                    if elem.tag in tags or (match is not None and match(elem)):
+                        matched.append(elem)
+                elif matched and matched[-1] is elem:
+                    matched.pop()
+                    yield cls(elem)
+                    if not matched:
+                        clear_element(elem)
+                elif not matched:
+                    clear_element(elem)
+
+        for chunk in iter_chunks(source, chunk_size):
+            yield from _events(chunk)
+        yield from _events(None)
+
+    @traced
+    def attr(self, name):  # type: (str) -> HtmlVector[str | None]
+        ret = self.apply(_attr, name)
         return ret  # type: ignore[return-value]
 
-    def css(self, expr):  # type: (str) -> HtmlVector[HtmlElement]
+    @traced
+    def css(self, expr, namespaces=None):  # type: (str, Mapping[str, str] | None) -> HtmlVector[HtmlElement]
+        selector = self.selector_cache.css(expr, namespaces)
+
         def _css(item: HtmlElement) -> list[HtmlElement]:
             if not isinstance(item, HtmlElement):
                 raise TypeError(f'Required HtmlElement instead of {type(item)}')
-            return item.cssselect(expr)  # type: ignore[no-any-return]
+            return selector(item)  # type: ignore[return-value]
 
-        ret = self.apply(_css)
-        ret.depth += 1
+        ret = self.apply(_css).level(down=1)
         return ret  # type: ignore[return-value]
 
-    def xpath(self, expr):  # type: (str) -> HtmlVector[HtmlElement] | HtmlVector[bool] | HtmlVector[builtins.float] | HtmlVector[str]
+    @traced
+    def xpath(self, expr, namespaces=None):  # type: (str, Mapping[str, str] | None) -> HtmlVector[HtmlElement] | HtmlVector[bool] | HtmlVector[builtins.float] | HtmlVector[str]
+        selector = self.selector_cache.xpath(expr, namespaces)
+
         def _xpath(
             item: HtmlElement,
         ) -> list[HtmlElement] | list[bool] | list[float] | list[str]:
             if not isinstance(item, HtmlElement):
                 raise TypeError(f'Required HtmlElement instead of {type(item)}')
-            return item.xpath(expr)  # type: ignore[no-any-return]
+            result = selector(item)
+            # count(), string() and boolean() expressions return single value
+            return result if isinstance(result, list) else [result]
 
-        ret = self.apply(_xpath)  # type: ignore[misc]
-        ret.depth += 1
+        ret = self.apply(_xpath).level(down=1)  # type: ignore[misc]
         return ret  # type: ignore[return-value]
 
 
+class Step(NamedTuple):
+    """
+    Single recorded operation of lazy vector.
+    """
+
+    name: str
+    args: tuple[Any, ...] = ()
+    kwargs: dict[str, Any] = {}  # never mutated
+    func: 'Callable[..., Any] | None' = None  # set for elementwise operations
+
+
+class LazyVector[T]:
+    """
+    Recorded chain of vector operations, evaluated on `collect()`.
+
+    Consecutive elementwise operations are fused and run in a single pass over
+    bottom level values; intermediate vectors are only built by structural
+    operations like `css`, `xpath`, `join` or `flatten`. Chain without source
+    vector can be recorded once and run against many vectors with `run()`.
+    """
+
+    def __init__(
+        self,
+        source: StVector[T] | None = None,
+        steps: tuple[Step, ...] = (),
+    ) -> None:
+        self.source = source
+        self.steps = steps
+
+    def __repr__(self) -> str:
+        chain = ''.join(f'.{step.name}()' for step in self.steps)
+        return f'{self.__class__.__name__}({chain})'
+
+    def collect(self) -> StVector[Any]:
+        """
+        Evaluate recorded operations on source vector.
+        """
+        if self.source is None:
+            raise ValueError('Unable to collect lazy vector without source')
+        return self.run(self.source)
+
+    def run(self, vector: StVector[Any]) -> StVector[Any]:
+        """
+        Evaluate recorded operations on arbitrary vector.
+        """
+        pending: list[Step] = []
+        for step in self.steps:
+            if step.func is not None:
+                pending.append(step)
+                continue
+            vector = run_steps(vector, pending)
+            pending = []
+            vector = getattr(vector, step.name)(*step.args, **step.kwargs)
+        return run_steps(vector, pending)
+
+    def _elementwise(self, name: str, func: 'Callable[..., Any]', *args: Any) -> Self:
+        return self.__class__(self.source, (*self.steps, Step(name, args, func=func)))
+
+    def _structural(self, name: str, *args: Any, **kwargs: Any) -> Self:
+        return self.__class__(self.source, (*self.steps, Step(name, args, kwargs)))
+
+    # elementwise operations
+
+    def apply(self, func, *args):  # type: (Callable[..., Any], Any) -> Self
+        return self._elementwise('apply', func, *args)
+
+    def attr(self, name):  # type: (str) -> Self
+        return self._elementwise('attr', _attr, name)
+
+    def date(self, fmt=None):  # type: (str | None) -> Self
+        return self._elementwise('date', _date, fmt)
+
+    def datetime(self, fmt=None, tz=None):  # type: (str | None, str | tzinfo | None) -> Self
+        return self._elementwise('datetime', _datetime, fmt, get_tzinfo(tz))
+
+    def float(self):  # type: () -> Self
+        return self._elementwise('float', _float)
+
+    def int(self):  # type: () -> Self
+        return self._elementwise('int', _int)
+
+    def normspace(self):  # type: () -> Self
+        return self._elementwise('normspace', _normspace)
+
+    def regex_extract(self, pattern, group=None, flags=0):  # type: (str | re.Pattern[str], builtins.int | str | None, builtins.int) -> Self
+        regex = re.compile(pattern, flags)
+        group = default_group(regex) if group is None else group
+        return self._elementwise('regex_extract', _regex_extract, regex, group)
+
+    def regex_match(self, pattern, flags=0):  # type: (str | re.Pattern[str], builtins.int) -> Self
+        regex = re.compile(pattern, flags)
+        return self._elementwise('regex_match', _regex_match, regex)
+
+    def regex_sub(self, pattern, repl, count=0, flags=0):  # type: (str | re.Pattern[str], str | Callable[[re.Match[str]], str], builtins.int, builtins.int) -> Self
+        regex = re.compile(pattern, flags)
+        return self._elementwise('regex_sub', _regex_sub, regex, repl, count)
+
+    def replace(self, old, new, count=-1):  # type: (str, str, builtins.int) -> Self
+        return self._elementwise('replace', _replace, old, new, count)
+
+    def string(self):  # type: () -> Self
+        return self._elementwise('string', _str)
+
+    def strip(self, chars=None):  # type: (str | None) -> Self
+        return self._elementwise('strip', _strip, chars)
+
+    def text(self):  # type: () -> Self
+        return self._elementwise('text', _text)
+
+    # structural operations
+
+    def __getitem__(self, index):  # type: (SupportsIndex | slice | Sequence[builtins.int] | Sequence[bool] | np.ndarray[Any, Any] | StVector[Any]) -> Self
+        return self._structural('__getitem__', index)
+
+    def all_(self):  # type: () -> Self
+        return self._structural('all_')
+
+    def any_(self):  # type: () -> Self
+        return self._structural('any_')
+
+    def css(self, expr, namespaces=None):  # type: (str, Mapping[str, str] | None) -> Self
+        return self._structural('css', expr, namespaces)
+
+    def flatten(self, level=1):  # type: (builtins.int) -> Self
+        return self._structural('flatten', level)
+
+    def join(self, sep=' '):  # type: (str | Sequence[str]) -> Self
+        return self._structural('join', sep)
+
+    def level(self, index=None, /, up=0, down=0):  # type: (builtins.int | None, builtins.int, builtins.int) -> Self
+        return self._structural('level', index, up=up, down=down)
+
+    def regex_findall(self, pattern, flags=0):  # type: (str | re.Pattern[str], builtins.int) -> Self
+        return self._structural('regex_findall', re.compile(pattern, flags))
+
+    def split(self, sep=' '):  # type: (str | Sequence[str]) -> Self
+        return self._structural('split', sep)
+
+    def xpath(self, expr, namespaces=None):  # type: (str, Mapping[str, str] | None) -> Self
+        return self._structural('xpath', expr, namespaces)
+
+
+# elementwise operations
+
+
+def _attr(item: HtmlElement, name: str) -> str | None:
+    if not isinstance(item, HtmlElement):
+        raise TypeError(f'Required HtmlElement instead of {type(item)}')
+    return item.get(name)  # type: ignore[no-any-return]
+
+
+def _date(item: str, fmt: str | None) -> date | None:
+    if not isinstance(item, str):
+        raise TypeError(f'Required str instead of {type(item)}')
+    try:
+        if fmt is None:
+            return date.fromisoformat(item.strip())
+        return datetime.strptime(item.strip(), fmt).date()
+    except ValueError:
+        return None
+
+
+def _datetime(item: str, fmt: str | None, tz: tzinfo | None) -> datetime | None:
+    if not isinstance(item, str):
+        raise TypeError(f'Required str instead of {type(item)}')
+    try:
+        if fmt is None:
+            dt = datetime.fromisoformat(item.strip())
+        else:
+            dt = datetime.strptime(item.strip(), fmt)
+        if dt.tzinfo is None and tz is not None:
+            dt = dt.replace(tzinfo=tz)
+        return dt
+    except ValueError:
+        return None
+
+
+def _float(item: str) -> float | None:
+    if not isinstance(item, str):
+        raise TypeError(f'Required str instead of {type(item)}')
+    try:
+        return float(item.strip())
+    except ValueError:
+        return None
+
+
+def _int(item: str) -> int | None:
+    if not isinstance(item, str):
+        raise TypeError(f'Required str instead of {type(item)}')
+    try:
+        return int(item.strip())
+    except BaseException:
+        return None
+
+
+def _normspace(item: str) -> str:
+    if not isinstance(item, str):
+        raise TypeError(f'Required str instead of {type(item)}')
+    return ' '.join(item.split())  # same as \s+ replacement, but faster
+
+
+def _regex_extract(item: str, regex: re.Pattern[str], group: int | str) -> str | None:
+    if not isinstance(item, str):
+        raise TypeError(f'Required str instead of {type(item)}')
+    match = regex.search(item)
+    return None if match is None else match.group(group)
+
+
+def _regex_findall(item: str, regex: re.Pattern[str]) -> list[Any]:
+    if not isinstance(item, str):
+        raise TypeError(f'Required str instead of {type(item)}')
+    return regex.findall(item)
+
+
+def _regex_match(item: str, regex: re.Pattern[str]) -> bool:
+    if not isinstance(item, str):
+        raise TypeError(f'Required str instead of {type(item)}')
+    return regex.match(item) is not None
+
+
+def _regex_sub(
+    item: str,
+    regex: re.Pattern[str],
+    repl: 'str | Callable[[re.Match[str]], str]',
+    count: int,
+) -> str:
+    if not isinstance(item, str):
+        raise TypeError(f'Required str instead of {type(item)}')
+    return regex.sub(repl, item, count=count)
+
+
+def _replace(item: str, old: str, new: str, count: int) -> str:
+    if not isinstance(item, str):
+        raise TypeError(f'Required str instead of {type(item)}')
+    return item.replace(old, new, count)
+
+
+def _str(item: object) -> str:
+    if isinstance(item, ElementBase):
+        return tostring(item).decode()
+    else:
+        return str(item)
+
+
+def _strip(item: str, chars: str | None) -> str:
+    if not isinstance(item, str):
+        raise TypeError(f'Required str or bytes instead of {type(item)}')
+    return item.strip() if chars is None else item.strip(chars)
+
+
+def _text(item: HtmlElement) -> str:
+    if not isinstance(item, HtmlElement):
+        raise TypeError(f'Required HtmlElement instead of {type(item)}')
+    return str(item.text_content())
+
+
+def _fused(
+    item: object,
+    funcs: 'Sequence[tuple[Callable[..., Any], tuple[Any, ...]]]',
+) -> object:
+    for func, args in funcs:
+        item = func(item, *args)
+    return item
+
+
 # helpers
 
 
+def run_fused[V: StVector[Any]](
+    vector: V,
+    funcs: 'Sequence[tuple[Callable[..., Any], tuple[Any, ...]]]',
+) -> V:
+    """
+    Apply chain of elementwise functions to vector in a single pass.
+    """
+    if not funcs:
+        return vector
+    elif len(funcs) == 1:
+        func, args = funcs[0]
+        return vector.apply(func, *args)  # type: ignore[return-value]
+    return vector.apply(_fused, tuple(funcs))  # type: ignore[return-value]
+
+
+def run_steps[V: StVector[Any]](vector: V, steps: 'Sequence[Step]') -> V:
+    """
+    Run fused elementwise steps, traced as single operation named after steps.
+    """
+    if not steps:
+        return vector
+    funcs = [(step.func, step.args) for step in steps]
+    return call_traced(
+        '.'.join(step.name for step in steps),
+        tuple(step.args for step in steps),
+        {},
+        vector,
+        partial(run_fused, vector, funcs),  # type: ignore[arg-type]
+    )
+
+
+def convert_batch[V](
+    values: 'Sequence[str]',
+    func: 'Callable[[str], V]',
+    item_func: 'Callable[[str], V | None]',
+) -> 'list[V | None]':
+    """
+    Convert all string values in one pass; fall back to item by item conversion
+    with `item_func` when some values are invalid or not strings.
+    """
+    if all(isinstance(v, str) for v in values):
+        try:
+            return list(map(func, map(str.strip, values)))
+        except ValueError:
+            pass
+    return [item_func(v) for v in values]
+
+
+def default_group(regex: re.Pattern[str]) -> int:
+    return 1 if regex.groups else 0
+
+
+def get_tzinfo(tz: str | tzinfo | None) -> tzinfo | None:
+    return ZoneInfo(tz) if isinstance(tz, str) else tz
+
+
+def iter_chunks(
+    source: 'str | os.PathLike[str] | BinaryIO | Iterable[bytes]',
+    chunk_size: int,
+) -> Iterator[bytes]:
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            yield from iter(partial(f.read, chunk_size), b'')
+    elif hasattr(source, 'read'):
+        while chunk := source.read(chunk_size):
+            if not isinstance(chunk, bytes):
+                raise TypeError(f'Required binary file instead of {type(source)}')
+            yield chunk
+    else:
+        yield from source
+
+
+def clear_element(elem: ElementBase) -> None:
+    """
+    Drop element content and already processed preceding siblings.
+    """
+    elem.clear()
+    parent = elem.getparent()
+    if parent is not None:
+        while elem.getprevious() is not None:
+            del parent[0]
+
+
 def iterable_required(item: object) -> TypeError:
     return TypeError(f'Unable to iterate object of type {type(item).__name__}')
 
@@ -345,6 +963,143 @@ def iter_at_level(data: Nested[T], level: int) -> Iterable[Nested[T]]:
             yield from iter_at_level(item, level=level - 1)
 
 
+def from_nested[V](data: Nested[V], depth: int) -> tuple[list[Nested[V]], Offsets]:
+    """
+    Split nested list into bottom level values at specified depth and offsets arrays.
+    """
+    if depth < 0:
+        raise ValueError(f'Invalid negative level {depth}')
+    values: list[Nested[V]] = [data]
+    offsets = []
+    for _ in range(depth):
+        values, level_offsets = explode_level(values)
+        offsets.append(level_offsets)
+    return values, tuple(offsets)
+
+
+def to_nested[V](values: list[V], offsets: Offsets) -> Nested[V]:
+    """
+    Build nested list from bottom level values and offsets arrays.
+    """
+    items: list[Nested[V]] = values  # type: ignore[assignment]
+    for level_offsets in reversed(offsets):
+        items = [items[start:stop] for start, stop in pairwise(level_offsets)]
+    return items[0]
+
+
+def explode_level[V](items: list[Nested[V]]) -> tuple[list[Nested[V]], array[int]]:
+    values: list[Nested[V]] = []
+    offsets = array('q', [0])
+    for item in items:
+        if not isinstance(item, list):
+            raise iterable_required(item)
+        values.extend(item)
+        offsets.append(len(values))
+    return values, offsets
+
+
+def explode_values[V](values: list[V], offsets: Offsets) -> tuple[list[V], Offsets]:
+    """
+    Add one level by splitting bottom level lists.
+    """
+    new_values, level_offsets = explode_level(values)  # type: ignore[arg-type]
+    return new_values, offsets + (level_offsets,)  # type: ignore[return-value]
+
+
+def collapse_values[V](values: list[V], offsets: Offsets) -> tuple[list[V], Offsets]:
+    """
+    Remove one level by grouping bottom level values into lists.
+    """
+    new_values = [values[start:stop] for start, stop in pairwise(offsets[-1])]
+    return new_values, offsets[:-1]  # type: ignore[return-value]
+
+
+def compose_offsets(offsets: Offsets) -> array[int]:
+    """
+    Merge several consecutive offsets arrays into single one.
+    """
+    ret = offsets[0]
+    for level_offsets in offsets[1:]:
+        ret = array('q', (level_offsets[i] for i in ret))
+    return ret
+
+
+def select_positions(
+    offsets: array[int],
+    key: 'slice | Collection[int]',
+) -> tuple[array[int], array[int]]:
+    """
+    Get positions of values selected in each group by slice or group positions,
+    and new offsets of groups.
+    """
+    positions = array('q')
+    new_offsets = array('q', [0])
+    for start, stop in pairwise(offsets):
+        group = range(start, stop)
+        if isinstance(key, slice):
+            positions.extend(group[key])
+        else:
+            positions.extend(group[i] for i in key)  # raises IndexError
+        new_offsets.append(len(positions))
+    return positions, new_offsets
+
+
+def int_index(index: object) -> int | None:
+    """
+    Convert integer index, including NumPy integer, to int, or return None.
+    """
+    if not isinstance(index, SupportsIndex):
+        return None
+    try:
+        return operator.index(index)
+    except TypeError:  # NumPy arrays of more than one item
+        return None
+
+
+def is_mask(index: 'Collection[object]') -> bool:
+    """
+    Check if index is non-empty sequence of booleans, or NumPy boolean array.
+    """
+    if (dtype := getattr(index, 'dtype', None)) is not None:
+        return bool(dtype.kind == 'b')
+    if len(index) == 0:
+        return False
+    # NumPy booleans can only be present when NumPy is already imported
+    numpy = sys.modules.get('numpy')
+    types = (bool,) if numpy is None else (bool, numpy.bool_)
+    return all(isinstance(i, types) for i in index)
+
+
+def mask_positions(
+    offsets: array[int],
+    mask: 'Collection[object]',
+) -> tuple[array[int], array[int]]:
+    """
+    Get positions of values where mask is true, and new offsets of groups.
+    """
+    positions = array('q', compress(range(len(mask)), mask))
+    kept = array('q', accumulate(map(bool, mask), initial=0))
+    return positions, array('q', (kept[i] for i in offsets))
+
+
+def get_shape(offsets: Offsets) -> Shape:
+    """
+    Get uniform size of groups at each level, `None` for ragged levels.
+    """
+    shape: list[int | None] = []
+    for level_offsets in offsets:
+        groups = len(level_offsets) - 1
+        total = level_offsets[-1]
+        size = total // groups if groups else 0
+        if size * groups != total:
+            shape.append(None)
+        elif size and level_offsets != array('q', range(0, total + 1, size)):
+            shape.append(None)
+        else:
+            shape.append(size)
+    return tuple(shape)
+
+
 def get_nested_scalar(data: Nested[T], recurse: bool = True) -> T:
     if not isinstance(data, list):
         return data
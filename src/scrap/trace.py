@@ -0,0 +1,201 @@
+import sys
+from collections.abc import Callable, Mapping
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from functools import wraps
+from threading import Lock
+from time import perf_counter
+from types import TracebackType
+from typing import Any, NamedTuple, Self
+
+SELECTOR_OPS = frozenset({'css', 'xpath'})
+
+_tracers: ContextVar[tuple['Tracer', ...]] = ContextVar('scrap_tracers', default=())
+_busy: ContextVar[bool] = ContextVar('scrap_trace_busy', default=False)
+_methods: list[Callable[..., Any]] = []  # registered with @traced
+_active = 0  # number of active tracers in all threads
+_active_lock = Lock()
+
+
+class OpRecord(NamedTuple):
+    """
+    Single traced vector operation.
+    """
+
+    name: str
+    args: tuple[Any, ...]
+    kwargs: dict[str, Any]
+    depth_in: int
+    depth_out: int | None  # None when result is not a vector
+    leaves_in: int
+    leaves_out: int | None
+    elapsed: float  # seconds
+
+    @property
+    def selector(self) -> str:
+        """
+        Selector expression of `css` and `xpath` operations, empty otherwise.
+        """
+        if self.name in SELECTOR_OPS and self.args:
+            return str(self.args[0])
+        return ''
+
+
+@dataclass(slots=True)
+class OpStats:
+    calls: int = 0
+    elapsed: float = 0.0
+    max_elapsed: float = 0.0
+    leaves_in: int = 0
+    leaves_out: int = 0
+
+
+class Tracer:
+    """
+    Collector of vector operation records, active inside `with` block in current
+    thread or task. Only outermost operations are traced: `css` calling `apply`
+    internally is recorded once.
+
+    Records are aggregated by operation name and selector, and optionally kept in
+    `records` or passed to `callback`. Tracer `tags`, like project name, are added
+    to rows returned by `export()`.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[OpRecord], None] | None = None,
+        keep: bool = False,
+        **tags: str,
+    ) -> None:
+        self.callback = callback
+        self.keep = keep
+        self.tags = tags
+        self.records: list[OpRecord] = []
+        self.stats: dict[tuple[str, str], OpStats] = {}
+        self._lock = Lock()
+        self._tokens: list[Token[tuple[Tracer, ...]]] = []
+
+    def __enter__(self) -> Self:
+        global _active
+        with _active_lock:
+            if _active == 0:
+                install_wrappers(True)
+            _active += 1
+        self._tokens.append(_tracers.set((*_tracers.get(), self)))
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        global _active
+        _tracers.reset(self._tokens.pop())
+        with _active_lock:
+            _active -= 1
+            if _active == 0:
+                install_wrappers(False)
+
+    def add(self, record: OpRecord) -> None:
+        with self._lock:
+            if self.keep:
+                self.records.append(record)
+            stats = self.stats.setdefault((record.name, record.selector), OpStats())
+            stats.calls += 1
+            stats.elapsed += record.elapsed
+            stats.max_elapsed = max(stats.max_elapsed, record.elapsed)
+            stats.leaves_in += record.leaves_in
+            stats.leaves_out += record.leaves_out or 0
+        if self.callback is not None:
+            self.callback(record)
+
+    def export(self) -> list[dict[str, Any]]:
+        """
+        Get aggregated stats as flat rows, slowest operations first.
+        """
+        with self._lock:
+            items = sorted(self.stats.items(), key=lambda kv: -kv[1].elapsed)
+            return [
+                {
+                    **self.tags,
+                    'name': name,
+                    'selector': selector,
+                    'calls': s.calls,
+                    'elapsed': s.elapsed,
+                    'max_elapsed': s.max_elapsed,
+                    'leaves_in': s.leaves_in,
+                    'leaves_out': s.leaves_out,
+                }
+                for (name, selector), s in items
+            ]
+
+
+def traced[F: Callable[..., Any]](method: F) -> F:
+    """
+    Register vector method to be traced. Methods are replaced with tracing wrappers
+    only while any tracer is active, so tracing has no overhead when disabled.
+    """
+    _methods.append(method)
+    return method
+
+
+def install_wrappers(enable: bool) -> None:
+    for method in _methods:
+        *path, name = method.__qualname__.split('.')
+        owner: Any = sys.modules[method.__module__]
+        for part in path:
+            owner = getattr(owner, part)
+        setattr(owner, name, wrap_method(method) if enable else method)
+
+
+def wrap_method(method: Callable[..., Any]) -> Callable[..., Any]:
+    name = method.__name__
+
+    @wraps(method)
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        if not _tracers.get() or _busy.get():
+            return method(self, *args, **kwargs)
+        return call_traced(
+            name, args, kwargs, self, lambda: method(self, *args, **kwargs)
+        )
+
+    return wrapper
+
+
+def call_traced[R](
+    name: str,
+    args: tuple[Any, ...],
+    kwargs: Mapping[str, Any],
+    vector: Any,
+    call: Callable[[], R],
+) -> R:
+    """
+    Run operation on vector and report it to active tracers; nested operations
+    are not reported.
+    """
+    tracers = _tracers.get()
+    if not tracers or _busy.get():
+        return call()
+    token = _busy.set(True)
+    start = perf_counter()
+    try:
+        ret = call()
+    finally:
+        elapsed = perf_counter() - start
+        _busy.reset(token)
+    # len() is used instead of values, which would materialize views
+    is_vector = hasattr(ret, 'offsets')
+    record = OpRecord(
+        name=name,
+        args=args,
+        kwargs=dict(kwargs),
+        depth_in=vector.depth,
+        depth_out=ret.depth if is_vector else None,  # type: ignore[attr-defined]
+        leaves_in=len(vector),
+        leaves_out=len(ret) if is_vector else None,  # type: ignore[arg-type]
+        elapsed=elapsed,
+    )
+    for tracer in tracers:
+        tracer.add(record)
+    return ret
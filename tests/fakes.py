@@ -0,0 +1,31 @@
+from collections.abc import Callable
+
+from scrap.fake import Content, FakeBrowser
+
+
+class Browser(FakeBrowser):
+    """
+    Fake browser serving `<p>{url}</p>` for any url, recording visits and
+    concurrent navigations, and failing urls matched by `fail`.
+    """
+
+    def __init__(self, fail: Callable[[str], bool] | None = None) -> None:
+        super().__init__({}, latency=10)
+        self.fail = fail
+        self.visits: list[str] = []
+        self.active = 0
+        self.max_active = 0
+
+    def lookup(self, url: str) -> Content:
+        return f'<p>{url}</p>'
+
+    async def navigate(self, url: str) -> None:
+        self.visits.append(url)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await super().navigate(url)
+            if self.fail is not None and self.fail(url):
+                raise ConnectionError(url)
+        finally:
+            self.active -= 1
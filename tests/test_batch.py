@@ -0,0 +1,70 @@
+from multiprocessing import get_context
+from typing import Any
+from uuid import UUID
+from unittest import TestCase
+
+from scrap import BaseHtmlItem, LazyVector, extract_many
+from scrap.batch import Extractor
+from scrap.stvector import HtmlElement, HtmlVector, StVector
+
+# fork is unsafe when test process has threads
+MP_CONTEXT = get_context('forkserver')
+
+
+def titles(vector: HtmlVector[HtmlElement]) -> StVector[str]:
+    return vector.css('li').text()
+
+
+def first_li(vector: HtmlVector[HtmlElement]) -> object:
+    return vector.css('li')[0].scalar()
+
+
+def make_items(count: int) -> list[BaseHtmlItem]:
+    return [
+        BaseHtmlItem(url=f'https://example.com/{i}', html=f'<ul><li>{i}</li></ul>')
+        for i in range(count)
+    ]
+
+
+def extract(
+    items: list[BaseHtmlItem],
+    extractor: Extractor,
+    **kwargs: Any,
+) -> list[tuple[UUID, object]]:
+    return list(extract_many(items, extractor, mp_context=MP_CONTEXT, **kwargs))
+
+
+class ExtractManyTest(TestCase):
+    def test_ordered(self) -> None:
+        items = make_items(5)
+        expected = [(item.iid, [str(i)]) for i, item in enumerate(items)]
+        self.assertEqual(extract(items, titles, workers=2), expected)
+
+    def test_unordered(self) -> None:
+        items = make_items(10)
+        results = extract(items, titles, workers=2, chunksize=3, ordered=False)
+        expected = [(item.iid, [str(i)]) for i, item in enumerate(items)]
+        self.assertEqual(sorted(results), sorted(expected))
+
+    def test_lazy_vector(self) -> None:
+        chain: LazyVector[Any] = LazyVector().css('li').text().int()
+        results = extract(make_items(3), chain, workers=1)
+        self.assertEqual([r for _, r in results], [[0], [1], [2]])
+
+    def test_chunks(self) -> None:
+        items = make_items(50)
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                results = extract(items, titles, workers=workers, chunksize=4)
+                self.assertEqual([r for _, r in results], [[str(i)] for i in range(50)])
+
+    def test_memo(self) -> None:
+        items = make_items(3) + make_items(3)
+        memo: dict[str, object] = {}
+        results = extract(items, titles, workers=1, memo=memo)
+        self.assertEqual([r for _, r in results], [['0'], ['1'], ['2']] * 2)
+        self.assertEqual(len(memo), 3)
+
+    def test_element_result(self) -> None:
+        with self.assertRaisesRegex(TypeError, 'plain values'):
+            extract(make_items(1), first_li, workers=1)
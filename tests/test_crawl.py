@@ -0,0 +1,70 @@
+from collections import Counter
+from collections.abc import AsyncIterator
+from unittest import IsolatedAsyncioTestCase
+
+from scrap import BaseHtmlItem, Crawler, PagePool
+
+from .fakes import Browser
+
+
+class CrawlerTest(IsolatedAsyncioTestCase):
+    async def test_per_host_limit(self) -> None:
+        browser = Browser()
+        pool = PagePool(browser, size=4)
+        crawler = Crawler(pool, BaseHtmlItem, per_host=1)
+        urls = [f'https://{host}.com/{i}' for i in range(5) for host in 'ab']
+        items = [item async for item in crawler.crawl(urls)]
+        self.assertEqual(sorted(i.url for i in items), sorted(urls))
+        self.assertEqual(items[0].html, f'<p>{items[0].url}</p>')
+        self.assertEqual(browser.max_active, 2)  # one per host
+        self.assertEqual(crawler.stats.fetched, 10)
+
+    async def test_priority(self) -> None:
+        browser = Browser()
+        crawler = Crawler(PagePool(browser, size=1), BaseHtmlItem)
+        crawler.add('https://a.com/low', priority=1)
+        crawler.add('https://a.com/high', priority=-1)
+        crawler.add('https://a.com/normal')
+        _ = [item async for item in crawler.crawl()]
+        self.assertEqual(
+            browser.visits,
+            ['https://a.com/high', 'https://a.com/normal', 'https://a.com/low'],
+        )
+
+    async def test_rate(self) -> None:
+        browser = Browser()
+        crawler = Crawler(PagePool(browser, size=4), BaseHtmlItem, rate=50)
+        urls = [f'https://a.com/{i}' for i in range(5)]
+        _ = [item async for item in crawler.crawl(urls)]
+        self.assertEqual(browser.max_active, 1)  # 20ms interval > 10ms visit
+
+    async def test_retries(self) -> None:
+        browser = Browser(fail=lambda url: url.endswith('/bad'))
+        pool = PagePool(browser, size=2)
+        crawler = Crawler(pool, BaseHtmlItem, retries=2, retry_delay=0.001)
+        urls = ['https://a.com/good', 'https://a.com/bad']
+        items = [item async for item in crawler.crawl(urls)]
+        self.assertEqual([i.url for i in items], ['https://a.com/good'])
+        self.assertEqual(Counter(browser.visits)['https://a.com/bad'], 3)
+        self.assertEqual(list(crawler.errors), ['https://a.com/bad'])
+        self.assertIsInstance(crawler.errors['https://a.com/bad'], ConnectionError)
+        self.assertEqual((crawler.stats.retried, crawler.stats.failed), (2, 1))
+        self.assertEqual(pool.stats.errors, 3)
+
+    async def test_backpressure(self) -> None:
+        async def stream() -> AsyncIterator[str]:
+            for i in range(100):
+                yield f'https://a.com/{i}'
+
+        browser = Browser()
+        crawler = Crawler(
+            PagePool(browser, size=2),
+            BaseHtmlItem,
+            buffer=2,
+            max_queued=4,
+        )
+        async for _ in crawler.crawl(stream()):
+            break
+        # stream and fetching stop when consumer stops
+        self.assertLess(len(browser.visits), 10)
+        self.assertLessEqual(crawler.stats.queued, 10)
@@ -0,0 +1,63 @@
+import re
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import IsolatedAsyncioTestCase
+
+from scrap import BaseHtmlItem, BrowserProtocol, FakeBrowser, PageProtocol
+
+
+class FakeBrowserTest(IsolatedAsyncioTestCase):
+    async def test_mapping(self) -> None:
+        browser = FakeBrowser(
+            {
+                'https://example.com/a': '<p>a</p>',
+                '/b': '<p>b</p>',
+                '/feed': lambda pos: f'<p>{pos}</p>',
+            },
+            latency=(1, 2),
+        )
+        self.assertIsInstance(browser, BrowserProtocol)
+        page = await browser.open_page()
+        self.assertIsInstance(page, PageProtocol)
+        await page.goto_url('https://example.com/a')
+        item = await BaseHtmlItem.from_page(page)
+        self.assertEqual(item.get_vector().css('p').text().data, ['a'])
+        await page.goto_url('https://other.com/b')
+        self.assertEqual(await page.get_content(), '<p>b</p>')
+        with self.assertRaises(LookupError):
+            await page.goto_url('https://example.com/missing')
+        self.assertEqual(browser.requests, 2)
+        await page.close()
+        self.assertEqual(browser.pages, [])
+
+    async def test_scroll(self) -> None:
+        browser = FakeBrowser({'/feed': lambda pos: str(pos)}, max_scroll=3)
+        page = await browser.open_page()
+        await page.goto_url('https://example.com/feed')
+        await page.scroll_page_down(2)
+        self.assertEqual(await page.get_content(), '2')
+        await page.scroll_bottom()
+        await page.scroll_page_down()
+        self.assertEqual(await page.get_content(), '3')
+        await page.scroll_page_up(5)
+        self.assertEqual(await page.get_content(), '0')
+
+    async def test_directory(self) -> None:
+        with TemporaryDirectory() as tmp:
+            (Path(tmp) / 'docs').mkdir()
+            (Path(tmp) / 'docs' / 'index.html').write_bytes('<p>café</p>'.encode())
+            browser = FakeBrowser(tmp)
+            page = await browser.open_page()
+            await page.goto_url('https://example.com/docs/')
+            self.assertEqual(await page.get_content(), '<p>café</p>')
+            with self.assertRaises(LookupError):
+                await page.goto_url('https://example.com/../etc/passwd')
+
+    async def test_expect_url(self) -> None:
+        browser = FakeBrowser({'/a': ''}, timeout=10)
+        page = await browser.open_page()
+        await page.goto_url('https://example.com/a')
+        await page.expect_url('https://example.com/*')
+        await page.expect_url(re.compile(r'/a$'))
+        with self.assertRaises(TimeoutError):
+            await page.expect_url('*/b', retry_delay=1)
@@ -0,0 +1,97 @@
+import gc
+import weakref
+from copy import deepcopy
+from dataclasses import asdict
+from unittest import TestCase
+
+from scrap import BaseHtmlItem, CompactHtmlItem
+from scrap.cache import LRUCache
+
+HTML = '<ul><li>a</li><li>b</li></ul>'
+
+
+class HtmlItemTest(TestCase):
+    def test_tree_memoized(self) -> None:
+        item = BaseHtmlItem(url='https://example.com/path', html=HTML)
+        self.assertIs(item.get_vector().scalar(), item.get_vector().scalar())
+        self.assertEqual(item.get_vector().css('li').text().data, ['a', 'b'])
+
+    def test_tree_invalidated(self) -> None:
+        item = BaseHtmlItem(url='https://example.com/path', html=HTML)
+        tree = item.get_vector().scalar()
+        item.html = '<p>c</p>'
+        self.assertIsNot(item.get_vector().scalar(), tree)
+        self.assertEqual(item.get_vector().css('p').text().data, ['c'])
+        tree = item.get_vector().scalar()
+        item.drop_tree()
+        self.assertIsNot(item.get_vector().scalar(), tree)
+
+    def test_tree_freed_with_item(self) -> None:
+        item = BaseHtmlItem(url='https://example.com/path', html=HTML)
+        tree = weakref.ref(item.get_vector().scalar())
+        copied = deepcopy(item)
+        self.assertEqual(copied.get_vector().css('li').text().data, ['a', 'b'])
+        del item
+        gc.collect()
+        self.assertIsNone(tree())
+
+    def test_tree_not_field(self) -> None:
+        item = BaseHtmlItem(url='https://example.com/path', html=HTML)
+        item.get_vector()
+        self.assertEqual(
+            sorted(asdict(item)), ['content_hash', 'created_at', 'html', 'iid', 'url']
+        )
+
+    def test_shared_tree_cache(self) -> None:
+        BaseHtmlItem.tree_cache = LRUCache(8)
+        try:
+            item = BaseHtmlItem(url='https://example.com/a', html=HTML)
+            other = BaseHtmlItem(url='https://example.com/b', html=HTML)
+            self.assertIs(item.get_vector().scalar(), other.get_vector().scalar())
+        finally:
+            BaseHtmlItem.tree_cache = None
+
+    def test_content_hash(self) -> None:
+        item = BaseHtmlItem(url='https://example.com/a', html=HTML)
+        other = CompactHtmlItem(url='https://example.com/b', html=HTML)
+        self.assertEqual(item.content_hash, other.content_hash)
+        item.html = '<p>c</p>'
+        self.assertNotEqual(item.content_hash, other.content_hash)
+
+    def test_lone_surrogate(self) -> None:
+        item = BaseHtmlItem(url='https://example.com/a', html='<p>\ud800</p>')
+        self.assertNotEqual(
+            item.content_hash, BaseHtmlItem(url='', html='').content_hash
+        )
+        self.assertEqual(len(item.get_vector().css('p')), 1)
+
+
+class CompactHtmlItemTest(TestCase):
+    def test_roundtrip(self) -> None:
+        item = CompactHtmlItem(url='https://example.com/a?b=1', html=HTML)
+        self.assertFalse(hasattr(item, '__dict__'))
+        self.assertIs(weakref.ref(item)(), item)
+        self.assertEqual(item.html, HTML)
+        self.assertEqual(item.url, 'https://example.com/a?b=1')
+        other = CompactHtmlItem(url='https://example.com/c', html=HTML)
+        self.assertIs(item.url_origin, other.url_origin)
+        self.assertEqual(item.get_vector().css('li').text().data, ['a', 'b'])
+        copied = deepcopy(item)
+        self.assertEqual(copied, item)
+        self.assertEqual(copied.content_hash, item.content_hash)
+        with self.assertRaises(AttributeError):  # html slot is not restored
+            object.__getattribute__(copied, 'html')
+
+    def test_lone_surrogate(self) -> None:
+        html = '<p>\ud800</p>'
+        item = CompactHtmlItem(url='https://example.com/', html=html)
+        self.assertEqual(item.html, html)
+        self.assertEqual(
+            item.content_hash, BaseHtmlItem(url='', html=html).content_hash
+        )
+
+    def test_update(self) -> None:
+        item = CompactHtmlItem(url='https://example.com/', html=HTML)
+        item.get_vector()
+        item.html = '<p>c</p>'
+        self.assertEqual(item.get_vector().css('p').text().data, ['c'])
@@ -0,0 +1,38 @@
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+
+from scrap import PagePool
+
+from .fakes import Browser
+
+
+class PagePoolTest(IsolatedAsyncioTestCase):
+    async def test_limit_and_recycle(self) -> None:
+        browser = Browser()
+
+        async def visit(pool: PagePool, url: str) -> str:
+            async with pool.page() as page:
+                await page.goto_url(url)
+                self.assertLessEqual(len(browser.pages), 2)
+                return await page.get_content()
+
+        async with PagePool(browser, size=2, max_uses=3) as pool:
+            urls = [f'https://example.com/{i}' for i in range(10)]
+            pages = await asyncio.gather(*(visit(pool, url) for url in urls))
+            self.assertEqual(pages, [f'<p>{url}</p>' for url in urls])
+            self.assertEqual(pool.stats.acquired, 10)
+            self.assertEqual(pool.stats.opened, 4)  # each page is used 3 times max
+            self.assertGreater(pool.stats.max_wait_time, 0)
+            self.assertGreater(pool.stats.utilization, 0)
+        self.assertEqual(browser.pages, [])
+
+    async def test_retire_on_error(self) -> None:
+        browser = Browser()
+        pool = PagePool(browser, size=1)
+        with self.assertRaises(RuntimeError):
+            async with pool.page():
+                raise RuntimeError
+        self.assertEqual((pool.stats.errors, pool.stats.retired), (1, 1))
+        self.assertEqual(browser.pages, [])
+        async with pool.page() as page:
+            self.assertEqual(await page.get_url(), 'about:blank')
@@ -0,0 +1,19 @@
+import subprocess
+import sys
+from unittest import TestCase
+
+from scrap.project import ProjectRegistry
+
+
+class ProjectRegistryTest(TestCase):
+    def test_empty_group(self) -> None:
+        registry = ProjectRegistry(group='scrap.tests.missing')
+        self.assertEqual(registry.names(), ())
+        self.assertEqual(registry.projects(), ())
+        with self.assertRaises(KeyError):
+            registry.get('missing')
+
+    def test_lazy_import(self) -> None:
+        code = 'import sys, scrap; print("lxml" in sys.modules); scrap.HtmlVector'
+        out = subprocess.check_output([sys.executable, '-c', code], text=True)
+        self.assertEqual(out.strip(), 'False')
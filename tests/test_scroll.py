@@ -0,0 +1,55 @@
+from unittest import IsolatedAsyncioTestCase
+
+from scrap import LazyVector, PageProtocol, Schema, ScrollHarvester
+from scrap.fake import FakeBrowser
+
+
+async def scroll_page(total: int, step: int) -> PageProtocol:
+    """
+    Feed page showing `step` more cards on every scroll, up to `total`.
+    """
+
+    def feed(position: int) -> str:
+        cards = ''.join(
+            f'<div class="card" data-id="{i}"><b>{i}</b><i>café</i></div>'
+            for i in range(min((position + 1) * step, total))
+        )
+        return f'<html><body><div id="feed">{cards}</div></body></html>'
+
+    page = await FakeBrowser({'/feed': feed}).open_page()
+    await page.goto_url('https://example.com/feed')
+    return page
+
+
+class ScrollHarvesterTest(IsolatedAsyncioTestCase):
+    async def test_harvest(self) -> None:
+        schema = Schema(
+            {
+                'title': LazyVector().css('b').text(),
+                'note': LazyVector().css('i').text(),
+            },
+            first=True,
+        )
+        harvester = ScrollHarvester(
+            '#feed > .card',
+            schema,
+            key=LazyVector().attr('data-id'),
+            delay=0,
+        )
+        page = await scroll_page(total=10, step=3)
+        rows = [row async for row in harvester.harvest(page)]
+        self.assertEqual(rows, [{'title': str(i), 'note': 'café'} for i in range(10)])
+        self.assertEqual(harvester.stats.rows, 10)
+        # 4 rounds with growth, then unchanged content is not parsed
+        self.assertEqual((harvester.stats.rounds, harvester.stats.parsed), (6, 4))
+
+    async def test_subtree_key(self) -> None:
+        schema = Schema({'title': LazyVector().css('b').text()}, first=True)
+        harvester = ScrollHarvester('.card', schema, delay=0, max_rounds=2)
+        rows = [row async for row in harvester.harvest(await scroll_page(10, 3))]
+        self.assertEqual(len(rows), 6)
+
+    def test_schema_rows(self) -> None:
+        schema = Schema({}, rows=LazyVector().css('.card'))
+        with self.assertRaises(ValueError):
+            ScrollHarvester('.card', schema)
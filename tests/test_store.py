@@ -0,0 +1,76 @@
+from datetime import timedelta
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from scrap import BaseHtmlItem, CompactHtmlItem, ItemStore
+from scrap.store import ContentStore
+
+
+class ItemStoreTest(TestCase):
+    def test_write_read(self) -> None:
+        items = [
+            BaseHtmlItem(url='https://example.com/', html=f'<p>{i}</p>')
+            for i in range(10)
+        ]
+        with TemporaryDirectory() as tmp:
+            with ItemStore[BaseHtmlItem](tmp, batch_size=4, index_interval=2) as store:
+                store.extend(reversed(items))
+                self.assertEqual(len(store.segments), 2)
+                self.assertEqual(len(store), 10)
+                self.assertEqual(list(store), items)  # includes unflushed items
+            with ItemStore[BaseHtmlItem](tmp) as store:
+                self.assertEqual(len(store.segments), 3)
+                self.assertEqual(store.get(items[5].iid), items[5])
+                self.assertEqual(
+                    list(store.scan(items[3].iid, items[7].iid)), items[3:7]
+                )
+                self.assertEqual(list(store.scan(end=items[0].iid)), [])
+
+    def test_time_range(self) -> None:
+        item = CompactHtmlItem(url='https://example.com/', html='<p>a</p>')
+        with TemporaryDirectory() as tmp:
+            with ItemStore[CompactHtmlItem](tmp) as store:
+                store.append(item)
+                store.flush()
+                second = timedelta(seconds=1)
+                found = list(
+                    store.scan(item.created_at - second, item.created_at + second)
+                )
+                self.assertEqual([i.html for i in found], ['<p>a</p>'])
+                self.assertEqual(list(store.scan(start=item.created_at + second)), [])
+
+    def test_dedup(self) -> None:
+        html = '<p>same</p>'
+        items = [
+            BaseHtmlItem(url='https://example.com/', html=html),
+            CompactHtmlItem(url='https://example.com/', html=html),
+        ]
+        with TemporaryDirectory() as tmp:
+            with ItemStore[BaseHtmlItem](tmp, dedup=True) as store:
+                store.extend(items)
+            with ItemStore[BaseHtmlItem](tmp, dedup=True) as store:
+                assert store.content is not None
+                self.assertEqual(len(store.content), 1)
+                self.assertEqual([i.html for i in store], [html, html])
+                self.assertEqual(store.content.get(items[0].content_hash), html)
+
+
+class ContentStoreTest(TestCase):
+    def test_shared_file(self) -> None:
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'content.dat'
+            first = ContentStore(path)
+            second = ContentStore(path)
+            try:
+                a = first.put('<p>a</p>')
+                b = second.put('<p>b</p>')  # appended after unseen record
+                size = path.stat().st_size
+                self.assertEqual(second.put('<p>a</p>'), a)
+                self.assertEqual(path.stat().st_size, size)  # not written twice
+                self.assertEqual(second.get(b), '<p>b</p>')
+                self.assertEqual(first.get(b), '<p>b</p>')
+                self.assertEqual(len(second), 2)
+            finally:
+                first.close()
+                second.close()
@@ -0,0 +1,338 @@
+import io
+from datetime import UTC, date, datetime
+from unittest import TestCase
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pyarrow as pa
+
+from scrap import (
+    HtmlVector,
+    IncrementalSchema,
+    LazyVector,
+    OpRecord,
+    Schema,
+    ShapeError,
+    Tracer,
+)
+from scrap.columnar import to_arrow_table
+from scrap.stvector import HtmlElement, StVector
+
+
+HTML = """
+<table>
+  <tr><td> a </td><td>1.5</td></tr>
+  <tr><td>b</td><td>x</td><td>2</td></tr>
+</table>
+"""
+
+
+class StorageTest(TestCase):
+    def test_roundtrip(self) -> None:
+        data = [[[1, 2], [3]], [[4], []], []]
+        vec = StVector(data, depth=3)
+        self.assertEqual(vec.data, data)
+        self.assertEqual(vec.values, [1, 2, 3, 4])
+        self.assertEqual(
+            [list(o) for o in vec.offsets], [[0, 3], [0, 2, 4, 4], [0, 2, 3, 4, 4]]
+        )
+
+    def test_len_bool_empty(self) -> None:
+        self.assertEqual(len(StVector([[1, 2], [3]], depth=2)), 3)
+        self.assertEqual(len(StVector(5)), 1)
+        self.assertFalse(StVector([[], []], depth=2))
+        self.assertFalse(StVector([[], []], depth=2).is_empty)
+        self.assertTrue(StVector([], depth=1).is_empty)
+
+    def test_shape(self) -> None:
+        vec = StVector([[1, 2], [3, 4], [5, 6]], depth=2)
+        self.assertEqual(
+            (vec.counts, vec.shape, vec.is_ragged), ((3, 6), (3, 2), False)
+        )
+        data: list[list[list[int]]] = [[[1, 2]], [[3]]]
+        vec = StVector(data, depth=3)  # type: ignore[arg-type]
+        self.assertEqual(
+            (vec.counts, vec.shape, vec.is_ragged), ((2, 2, 3), (2, 1, None), True)
+        )
+        self.assertEqual(StVector(5).shape, ())
+
+    def test_shape_error(self) -> None:
+        with self.assertRaises(TypeError):
+            StVector([[1], 2], depth=2)
+
+    def test_getitem(self) -> None:
+        vec = StVector([[1, 2], [3, 4, 5]], depth=2)
+        self.assertEqual(vec[0].data, [1, 3])
+        self.assertEqual(vec[-1].data, [2, 5])
+        self.assertEqual(vec[0][1].data, 3)
+        with self.assertRaises(IndexError):
+            vec[2]
+
+    def test_views(self) -> None:
+        vec = StVector([[1, 2, 3], [4, 5]], depth=2)
+        self.assertEqual(vec[1:].data, [[2, 3], [5]])
+        self.assertEqual(vec[[0, -1]].data, [[1, 3], [4, 5]])
+        mask = StVector([[True, False, True], [False, True]], depth=2)
+        view = vec[mask]
+        self.assertTrue(view.is_view)
+        self.assertEqual(len(view), 3)
+        self.assertEqual(view[1:].data, [[3], []])
+        self.assertEqual(view.data, [[1, 3], [5]])
+        self.assertFalse(view.is_view)  # materialized
+        self.assertEqual(vec[[True, False, False, True, False]].data, [[1], [4]])
+        with self.assertRaises(ShapeError):
+            vec[[True, False]]
+        with self.assertRaises(IndexError):
+            vec[[2]]
+
+    def test_numpy_index(self) -> None:
+        vec = StVector([[1, 2, 3], [4, 5]], depth=2)
+        self.assertEqual(vec[np.array([0, 1])].data, [[1, 2], [4, 5]])
+        mask = np.array([True, False, False, True, False])
+        self.assertEqual(vec[mask].data, [[1], [4]])
+        self.assertEqual(vec[list(mask)].data, [[1], [4]])
+        self.assertEqual(vec[np.int64(0)].data, [1, 4])
+        self.assertEqual(vec[np.intp(-1)].data, [3, 5])
+
+    def test_flatten_shares_values(self) -> None:
+        vec = StVector([[[1, 2], [3]], [[4], []]], depth=3)
+        flat = vec.flatten()
+        self.assertEqual(flat.data, [1, 2, 3, 4])
+        self.assertIs(flat.values, vec.values)
+        self.assertEqual(vec.flatten(2).data, [[1, 2, 3], [4]])
+
+    def test_level(self) -> None:
+        vec = StVector([[1, 2], [3]], depth=2)
+        self.assertEqual(vec.level(up=1).values, [[1, 2], [3]])
+        self.assertEqual(vec.level(up=1).level(down=1).data, [[1, 2], [3]])
+
+    def test_set_data_depth(self) -> None:
+        vec = StVector([[1, 2], [3]], depth=2)
+        vec.depth -= 1
+        self.assertEqual((vec.values, vec.depth), ([[1, 2], [3]], 1))
+        vec.data = [[4], [5, 6]]
+        self.assertEqual((vec.values, vec.shape), ([[4], [5, 6]], (2,)))
+        vec.depth += 1
+        self.assertEqual((vec.values, vec.shape), ([4, 5, 6], (2, None)))
+
+    def test_scalar(self) -> None:
+        self.assertEqual(StVector([[5]], depth=2).scalar(), 5)
+        with self.assertRaises(ShapeError):
+            StVector([[5, 6]], depth=2).scalar()
+        with self.assertRaises(ShapeError):
+            StVector([[5]], depth=2).scalar(nested=False)
+
+
+class ConversionTest(TestCase):
+    def test_float_int(self) -> None:
+        vec = StVector([[' 1.5', '2'], ['x']], depth=2)
+        self.assertEqual(vec.float().data, [[1.5, 2.0], [None]])
+        self.assertEqual(vec.int().data, [[None, 2], [None]])
+
+    def test_regex(self) -> None:
+        vec = StVector(['price: 12.50 USD', 'n/a'], depth=1)
+        self.assertEqual(vec.regex_extract(r'(\d+)\.(\d+)').data, ['12', None])
+        self.assertEqual(vec.regex_extract(r'[A-Z]+', flags=0).data, ['USD', None])
+        self.assertEqual(vec.regex_findall(r'\d+').data, [['12', '50'], []])
+        self.assertEqual(vec.regex_match(r'price').data, [True, False])
+        self.assertEqual(vec.regex_sub(r'\s+', '').data, ['price:12.50USD', 'n/a'])
+        chain = LazyVector(vec).regex_sub(r'\d', '#').regex_findall('#+')
+        self.assertEqual(chain.collect().data, [['##', '##'], []])
+
+    def test_iso_dates(self) -> None:
+        vec = StVector(['2024-01-02', 'bad', '2024-01-03T10:00:00+02:00'], depth=1)
+        self.assertEqual(vec.date().data, [date(2024, 1, 2), None, None])
+        dts = vec.datetime(tz='UTC')
+        self.assertEqual(dts[0].data, datetime(2024, 1, 2, tzinfo=ZoneInfo('UTC')))
+        self.assertEqual(dts[2].data, datetime(2024, 1, 3, 8, tzinfo=UTC))
+
+    def test_to_numpy(self) -> None:
+        arr = StVector([['1.5', 'x'], ['2']], depth=2).float().to_numpy()
+        self.assertEqual(arr.dtype, 'float64')
+        self.assertEqual(arr.mask.tolist(), [False, True, False])
+        self.assertEqual(arr.compressed().tolist(), [1.5, 2.0])
+
+    def test_to_columnar(self) -> None:
+        col = StVector([['1', 'x'], [], ['2']], depth=2).int().to_columnar()
+        self.assertEqual(col.values.tolist(), [1, 0, 2])
+        self.assertEqual(col.validity.tolist(), [True, False, True])
+        self.assertEqual([o.tolist() for o in col.offsets], [[0, 3], [0, 2, 2, 3]])
+
+    def test_to_arrow(self) -> None:
+        prices = StVector([['1.5', 'x'], [], ['2']], depth=2).float()
+        names = StVector(['a', 'b', 'c'], depth=1)
+        self.assertEqual(prices.to_arrow().to_pylist(), [[1.5, None], [], [2.0]])
+        table = to_arrow_table({'name': names, 'prices': prices})
+        self.assertEqual(table.num_rows, 3)
+        self.assertEqual(table.column('prices').type, pa.list_(pa.float64()))
+        with self.assertRaises(ShapeError):
+            to_arrow_table({'name': names, 'other': StVector([1], depth=1)})
+
+
+class HtmlVectorTest(TestCase):
+    def test_extract(self) -> None:
+        rows = HtmlVector.from_string(HTML).css('tr')
+        cells = rows.css('td').text().strip()
+        self.assertEqual(cells.data, [['a', '1.5'], ['b', 'x', '2']])
+        self.assertEqual(cells[1].float().data, [1.5, None])
+        self.assertEqual(cells.join('|').data, ['a|1.5', 'b|x|2'])
+
+    def test_filter_rows(self) -> None:
+        rows = HtmlVector.from_string(HTML).css('tr')
+        selected = rows[rows.css('td').text().strip().apply(lambda x: x == 'b').any_()]
+        self.assertEqual(selected.css('td').text().data, [['b', 'x', '2']])
+
+    def test_xpath_scalar(self) -> None:
+        rows = HtmlVector.from_string(HTML).css('tr')
+        self.assertEqual(rows.xpath('count(td)').data, [[2.0], [3.0]])
+        self.assertEqual(rows.xpath('string(td[2])').data, [['1.5'], ['x']])
+        self.assertEqual(rows.xpath('boolean(td[3])').data, [[False], [True]])
+        self.assertEqual(
+            HtmlVector.from_string(HTML).xpath('string(//td[2])').scalar(), '1.5'
+        )
+
+    def test_selector_cache(self) -> None:
+        cache = HtmlVector.selector_cache
+        vec = HtmlVector.from_string(HTML)
+        vec.css('td.cached')
+        info = cache.info()
+        vec.css('td.cached')
+        self.assertEqual(cache.info().hits, info.hits + 1)
+        self.assertEqual(cache.info().misses, info.misses)
+
+    def test_detach(self) -> None:
+        vec = HtmlVector.from_string(HTML)
+        cells = vec.css('tr').xpath('td/text()')
+        usage = cells.memory_usage()
+        self.assertEqual(usage.trees, 1)  # smart strings reference document
+        self.assertGreater(usage.documents, len(HTML))
+        detached = cells.detach()
+        self.assertEqual(detached.data, cells.data)
+        self.assertEqual(detached.memory_usage().trees, 0)
+        self.assertIs(type(detached.values[0]), str)
+        self.assertEqual(
+            vec.css('tr').css('td')[0].detach().data, ['<td> a </td>', '<td>b</td>']
+        )
+        self.assertEqual(
+            vec.css('tr').css('td')[0].detach(lambda e: e.tag).data, ['td', 'td']
+        )
+
+
+class LazyVectorTest(TestCase):
+    def test_collect(self) -> None:
+        vec = HtmlVector.from_string(HTML)
+        lazy = vec.lazy().css('tr').css('td').text().strip().float()
+        self.assertEqual(lazy.collect().data, [[None, 1.5], [None, None, 2.0]])
+        self.assertEqual(
+            lazy.collect().data, vec.css('tr').css('td').text().strip().float().data
+        )
+
+    def test_run_unbound(self) -> None:
+        chain: LazyVector[HtmlElement] = (
+            LazyVector().css('td').text().strip().replace('.', ',')
+        )
+        vec = HtmlVector.from_string(HTML)
+        self.assertEqual(chain.run(vec).data, ['a', '1,5', 'b', 'x', '2'])
+        with self.assertRaises(ValueError):
+            chain.collect()
+
+    def test_from_stream(self) -> None:
+        chunks = [
+            b'<div id="list"><div class="item"><a>1</a></div>',
+            b'<p><a>x</a></p>',
+        ]
+        chunks += [b'<div class="item"><a>2</a></div></div>']
+        items = HtmlVector.from_stream(chunks, css='#list > .item')
+        self.assertEqual([v.css('a').text().scalar() for v in items], ['1', '2'])
+        items = HtmlVector.from_stream(chunks, tags=['a'])
+        self.assertEqual([v.text().scalar() for v in items], ['1', 'x', '2'])
+        chunks = ['<div class="item">Café – naïve €</div>'.encode()]
+        items = HtmlVector.from_stream(chunks, css='.item', encoding='utf-8')
+        self.assertEqual([v.text().scalar() for v in items], ['Café – naïve €'])
+        text_file = io.StringIO('<p>a</p>')
+        with self.assertRaises(TypeError):
+            list(HtmlVector.from_stream(text_file, tags=['p']))  # type: ignore[arg-type]
+        for css in ('h2 + p', 'h2 ~ p'):
+            with self.subTest(css=css), self.assertRaises(ValueError):
+                list(HtmlVector.from_stream([b'<h2>t</h2><p>a</p>'], css=css))
+
+
+class TracerTest(TestCase):
+    def test_outermost_operations(self) -> None:
+        vec = HtmlVector.from_string(HTML)
+        records: list[OpRecord] = []
+        with Tracer(callback=records.append, project='test') as tracer:
+            vec.css('td').text().strip()
+            LazyVector(vec).css('tr').text().normspace().collect()
+        self.assertEqual(
+            [(r.name, r.selector, r.leaves_in, r.leaves_out) for r in records],
+            [
+                ('css', 'td', 1, 5),
+                ('text', '', 5, 5),
+                ('strip', '', 5, 5),
+                ('css', 'tr', 1, 2),
+                ('text.normspace', '', 2, 2),
+            ],
+        )
+        rows = tracer.export()
+        self.assertEqual({row['project'] for row in rows}, {'test'})
+        self.assertEqual(sum(row['calls'] for row in rows), 5)
+        self.assertNotIn('__wrapped__', vars(StVector.apply))  # uninstalled
+
+    def test_views_not_materialized(self) -> None:
+        vec = StVector([[1, 2, 3], [4, 5]], depth=2)
+        with Tracer(keep=True) as tracer:
+            view = vec[1:]
+        self.assertTrue(view.is_view)
+        self.assertEqual(tracer.records[0].leaves_out, 3)
+
+
+class SchemaTest(TestCase):
+    def test_rows(self) -> None:
+        schema = Schema(
+            {
+                'name': LazyVector().css('td').text().strip()[0],
+                'cells': LazyVector().css('td').text().strip(),
+                'count': LazyVector().css('td').apply(lambda x: 1).level(up=1),
+            },
+            rows=LazyVector().css('tr'),
+        )
+        with Tracer(keep=True) as tracer:
+            rows = schema.run(HtmlVector.from_string(HTML))
+        self.assertEqual(
+            rows,
+            [
+                {'name': 'a', 'cells': ['a', '1.5'], 'count': [1, 1]},
+                {'name': 'b', 'cells': ['b', 'x', '2'], 'count': [1, 1, 1]},
+            ],
+        )
+        self.assertEqual([r.selector for r in tracer.records].count('td'), 1)
+
+    def test_first(self) -> None:
+        schema = Schema({'value': LazyVector().css('tr').css('td').text()}, first=True)
+        self.assertEqual(schema.run(HtmlVector.from_string(HTML)), [{'value': ' a '}])
+
+    def test_incremental(self) -> None:
+        schema = Schema(
+            {'cells': LazyVector().css('td').text().strip()},
+            rows=LazyVector().css('tr'),
+        )
+        incremental = IncrementalSchema(schema)
+        old = HtmlVector.from_string(HTML)
+        new = HtmlVector.from_string(HTML.replace('<td>x</td>', '<td>y</td>'))
+        self.assertEqual(incremental.run(old), schema.run(old))
+        self.assertEqual(incremental.run(new), schema.run(new))
+        self.assertEqual(incremental.cache.info().misses, 3)  # 2 old rows, 1 changed
+        diff = incremental.diff(old, new)
+        self.assertEqual([len(d) for d in diff], [1, 1, 1])
+
+    def test_incremental_plain_values(self) -> None:
+        schema = Schema(
+            {'cells': LazyVector().xpath('td/text()')}, rows=LazyVector().css('tr')
+        )
+        incremental = IncrementalSchema(schema)
+        records = incremental.run(HtmlVector.from_string(HTML))
+        self.assertIs(type(records[0]['cells'][0]), str)  # not lxml smart string
+        records[0]['cells'].append('z')
+        again = incremental.run(HtmlVector.from_string(HTML))
+        self.assertEqual(again[0]['cells'], [' a ', '1.5'])